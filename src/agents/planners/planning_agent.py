@@ -25,11 +25,21 @@ class PlanningAgent(Agent):
     def run(self, deal: Deal) -> Opportunity:
         """
         Run the workflow for a particular deal
+        Kept as public API for pricing a single deal; plan() prices its deals in one batch instead
         :param deal: the deal, summarized from an RSS scrape
         :returns: an opportunity including the discount
         """
         self.log("Planning Agent is pricing up a potential deal")
         estimate = self.ensemble.price(deal.product_description)
+        return self.opportunity_for(deal, estimate)
+
+    def opportunity_for(self, deal: Deal, estimate: float) -> Opportunity:
+        """
+        Wrap a priced deal up as an opportunity
+        :param deal: the deal, summarized from an RSS scrape
+        :param estimate: the ensemble's estimate of the deal's true value
+        :returns: an opportunity including the discount
+        """
         discount = estimate - deal.price
         self.log(f"Planning Agent has processed a deal with discount ${discount:.2f}")
         return Opportunity(deal=deal, estimate=estimate, discount=discount)
@@ -45,8 +55,13 @@ class PlanningAgent(Agent):
         """
         self.log("Planning Agent is kicking off a run")
         selection = self.scanner.scan(memory=memory)
-        if selection:
-            opportunities = [self.run(deal) for deal in selection.deals[:5]]
+        if selection and selection.deals:
+            deals = selection.deals[:5]
+            self.log(f"Planning Agent is pricing up {len(deals)} potential deals")
+            estimates = self.ensemble.price_many([deal.product_description for deal in deals])
+            opportunities = [
+                self.opportunity_for(deal, estimate) for deal, estimate in zip(deals, estimates)
+            ]
             opportunities.sort(key=lambda opp: opp.discount, reverse=True)
             best = opportunities[0]
             self.log(
@@ -1,4 +1,5 @@
 import os
+import threading
 
 from dotenv import load_dotenv
 from litellm import completion
@@ -26,6 +27,8 @@ class Preprocessor:
         self.total_input_tokens = 0
         self.total_output_tokens = 0
         self.total_cost = 0
+        # preprocess() may be called from several threads when pricing deals concurrently
+        self._usage_lock = threading.Lock()
         self.model_name = model_name
         self.reasoning_effort = reasoning_effort
         self.base_url = base_url
@@ -43,8 +46,9 @@ class Preprocessor:
             reasoning_effort=self.reasoning_effort,
             api_base=self.base_url,
         )
-        self.total_input_tokens += response.usage.prompt_tokens
-        self.total_output_tokens += response.usage.completion_tokens
-        self.total_cost += response._hidden_params["response_cost"]
+        with self._usage_lock:
+            self.total_input_tokens += response.usage.prompt_tokens
+            self.total_output_tokens += response.usage.completion_tokens
+            self.total_cost += response._hidden_params["response_cost"]
         return response.choices[0].message.content
 
@@ -1,3 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
 from agents.base import Agent
 from agents.preprocessing.preprocessor import Preprocessor
 from agents.pricing.frontier_agent import FrontierAgent
@@ -7,6 +10,8 @@ from agents.pricing.specialist_agent import SpecialistAgent
 class EnsembleAgent(Agent):
     name = "Ensemble Agent"
     color = Agent.YELLOW
+    # Upper bound on concurrent remote calls when pricing several deals (respects upstream rate limits)
+    MAX_CONCURRENT_REQUESTS = 8
 
     def __init__(self, collection):
         """
@@ -31,12 +36,43 @@ class EnsembleAgent(Agent):
         self.log("Running Ensemble Agent - preprocessing text")
         rewrite = self.preprocessor.preprocess(description)
         self.log(f"Pre-processed text using {self.preprocessor.model_name}")
-        specialist = self.specialist.price(rewrite)
-        frontier = self.frontier.price(rewrite)
+        # Both models are remote (Modal / OpenAI), so run them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            specialist_future = executor.submit(self.specialist.price, rewrite)
+            frontier_future = executor.submit(self.frontier.price, rewrite)
+            specialist, frontier = specialist_future.result(), frontier_future.result()
         # neural_network = self.neural_network.price(rewrite)
         # combined = frontier * 0.8 + specialist * 0.1 + neural_network * 0.1
-        combined = frontier * 0.8 + specialist * 0.2
+        combined = self.combine(specialist, frontier)
 
         self.log(f"Ensemble Agent complete - returning ${combined:.2f}")
         return combined
 
+    def price_many(self, descriptions: List[str]) -> List[float]:
+        """
+        Run this ensemble model over several products
+        The frontier model's RAG lookups are batched into a single embed + Chroma query,
+        and the remote model calls for all products run concurrently
+        :param descriptions: the descriptions of the products
+        :return: an estimate of the price for each product, in order
+        """
+        self.log(f"Running Ensemble Agent on {len(descriptions)} products - preprocessing text")
+        with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_REQUESTS) as executor:
+            rewrites = list(executor.map(self.preprocessor.preprocess, descriptions))
+            self.log(f"Pre-processed text using {self.preprocessor.model_name}")
+            specialist_futures = [executor.submit(self.specialist.price, rewrite) for rewrite in rewrites]
+            # Same pool as the specialist calls, so at most MAX_CONCURRENT_REQUESTS are in flight overall
+            frontiers = self.frontier.price_many(rewrites, executor=executor)
+            specialists = [future.result() for future in specialist_futures]
+        combined = [
+            self.combine(specialist, frontier) for specialist, frontier in zip(specialists, frontiers)
+        ]
+        self.log(f"Ensemble Agent complete - returning {len(combined)} estimates")
+        return combined
+
+    @staticmethod
+    def combine(specialist: float, frontier: float) -> float:
+        """
+        Weight the individual model estimates into a single price
+        """
+        return frontier * 0.8 + specialist * 0.2
@@ -1,5 +1,6 @@
 import re
-from typing import Dict, List
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, List, Optional
 
 from openai import OpenAI
 
@@ -77,14 +78,22 @@ class FrontierAgent(Agent):
         match = re.search(r"[-+]?\d*\.\d+|\d+", s)
         return float(match.group()) if match else 0.0
 
-    def price(self, description: str) -> float:
+    def find_similars_many(self, descriptions: List[str]):
+        """
+        Return similar items for each description, using one batched lookup in the Chroma datastore
+        """
+        self.log(
+            f"Frontier Agent is performing a batched RAG search of the Chroma datastore for {len(descriptions)} products"
+        )
+        results = self.retriever.query_similars_batch(descriptions, n_results=5)
+        self.log("Frontier Agent has found similar products")
+        return results
+
+    def estimate(self, description: str, documents: List[str], prices: List[float]) -> float:
         """
         Make a call to OpenAI or DeepSeek to estimate the price of the described product,
-        by looking up 5 similar products and including them in the prompt to give context
-        :param description: a description of the product
-        :return: an estimate of the price
+        given similar products and their prices as context
         """
-        documents, prices = self.find_similars(description)
         self.log(
             f"Frontier Agent is about to call {self.MODEL} with context including 5 similar products"
         )
@@ -99,3 +108,33 @@ class FrontierAgent(Agent):
         self.log(f"Frontier Agent completed - predicting ${result:.2f}")
         return result
 
+    def price(self, description: str) -> float:
+        """
+        Make a call to OpenAI or DeepSeek to estimate the price of the described product,
+        by looking up 5 similar products and including them in the prompt to give context
+        :param description: a description of the product
+        :return: an estimate of the price
+        """
+        documents, prices = self.find_similars(description)
+        return self.estimate(description, documents, prices)
+
+    def price_many(
+        self, descriptions: List[str], max_workers: int = 8, executor: Optional[Executor] = None
+    ) -> List[float]:
+        """
+        Estimate the price of several products, embedding and querying the Chroma datastore once for all of them
+        and then calling the model for each product concurrently
+        :param descriptions: descriptions of the products
+        :param max_workers: maximum number of concurrent model calls
+        :param executor: run the model calls on this executor (sharing its concurrency limit) instead of a new pool
+        :return: an estimate of the price for each description, in order
+        """
+        similars = self.find_similars_many(descriptions)
+        if not similars:
+            return []
+        documents = [similar_documents for similar_documents, _ in similars]
+        prices = [similar_prices for _, similar_prices in similars]
+        if executor is not None:
+            return list(executor.map(self.estimate, descriptions, documents, prices))
+        with ThreadPoolExecutor(max_workers=max_workers) as own_executor:
+            return list(own_executor.map(self.estimate, descriptions, documents, prices))
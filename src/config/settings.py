@@ -1,26 +1,47 @@
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 
 
-@dataclass(frozen=True)
+def _env(name: str, default: str | None = None):
+    return field(default_factory=lambda: os.getenv(name, default))
+
+
+@dataclass
 class Settings:
     """
     Centralized environment-backed configuration.
 
     Keep this lightweight (no extra deps) so it works in simple scripts and notebooks.
+    Values are read when an instance is created (not at import), so a `.env` loaded after import is honored.
+    Use `get_settings()` for the shared instance and `Settings.refresh()` after reloading the environment.
     """
 
-    planner_mode: str = os.getenv("PLANNER_MODE", "autonomous").strip().lower()
+    planner_mode: str = field(
+        default_factory=lambda: os.getenv("PLANNER_MODE", "autonomous").strip().lower()
+    )
 
     # API keys / credentials (only some are required depending on enabled features)
-    openai_api_key: str | None = os.getenv("OPENAI_API_KEY")
-    groq_api_key: str | None = os.getenv("GROQ_API_KEY")
-    hf_token: str | None = os.getenv("HF_TOKEN")
+    openai_api_key: str | None = _env("OPENAI_API_KEY")
+    groq_api_key: str | None = _env("GROQ_API_KEY")
+    hf_token: str | None = _env("HF_TOKEN")
 
-    pushover_user: str | None = os.getenv("PUSHOVER_USER")
-    pushover_token: str | None = os.getenv("PUSHOVER_TOKEN")
+    pushover_user: str | None = _env("PUSHOVER_USER")
+    pushover_token: str | None = _env("PUSHOVER_TOKEN")
 
     # Optional overrides
-    hf_dataset_user: str = os.getenv("HF_DATASET_USER", "ed-donner")
-    pricer_preprocessor_model: str = os.getenv("PRICER_PREPROCESSOR_MODEL", "ollama/llama3.2")
+    hf_dataset_user: str = _env("HF_DATASET_USER", "ed-donner")
+    pricer_preprocessor_model: str = _env("PRICER_PREPROCESSOR_MODEL", "ollama/llama3.2")
+
+    @staticmethod
+    def refresh() -> "Settings":
+        """
+        Discard the cached settings (e.g. after `load_dotenv(override=True)`) and re-read the environment.
+        """
+        get_settings.cache_clear()
+        return get_settings()
+
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()
@@ -1,5 +1,4 @@
 import logging
-import os
 import sys
 from pathlib import Path
 from typing import List
@@ -10,8 +9,15 @@ from dotenv import load_dotenv
 from data.models import Opportunity
 from agents.planners.autonomous_planning_agent import AutonomousPlanningAgent
 from agents.planners.planning_agent import PlanningAgent
+from config.settings import Settings, get_settings
 from core.memory import MemoryStore
-from utils.visualization import compute_tsne_plot_data
+from utils.visualization import (
+    PROJECTION_VERSION,
+    compute_tsne_plot_data,
+    load_cached_plot_data,
+    plot_reducer,
+    save_plot_data_cache,
+)
 
 load_dotenv(override=True)
 
@@ -41,6 +47,8 @@ class DealAgentFramework:
 
     def __init__(self):
         init_logging()
+        # Pick up the environment as it is now (e.g. after `.env` was loaded).
+        Settings.refresh()
         client = chromadb.PersistentClient(path=self.DB)
         self.memory_store = MemoryStore(self.MEMORY_FILENAME)
         self.memory = self.memory_store.read()
@@ -50,7 +58,7 @@ class DealAgentFramework:
     def init_agents_as_needed(self):
         if not self.planner:
             self.log("Initializing Agent Framework")
-            mode = os.environ.get("PLANNER_MODE", "autonomous").strip().lower()
+            mode = get_settings().planner_mode
             if mode in ("workflow", "planning", "planning_agent", "plan"):
                 self.planner = PlanningAgent(self.collection)
                 self.log("Using PlanningAgent (workflow mode)")
@@ -84,15 +92,27 @@ class DealAgentFramework:
     # T-SNE default perplexity is 30; n_samples must be > perplexity
     _MIN_SAMPLES_FOR_TSNE = 31
 
+    # t-SNE projection cache, stored alongside the Chroma DB
+    _PLOT_CACHE_FILENAME = ".tsne_cache.npz"
+
     @classmethod
     def get_plot_data(cls, max_datapoints=2000):
         client = chromadb.PersistentClient(path=cls.DB)
         collection = client.get_or_create_collection("products")
-        return compute_tsne_plot_data(
+        # The 3D projection is expensive; only recompute when the collection, size or reducer changes.
+        cache_path = Path(cls.DB) / cls._PLOT_CACHE_FILENAME
+        cache_key = f"{collection.id}_{collection.count()}_{max_datapoints}_{plot_reducer()}_{PROJECTION_VERSION}"
+        cached = load_cached_plot_data(cache_path, cache_key)
+        if cached is not None:
+            return cached
+        plot_data = compute_tsne_plot_data(
             collection=collection,
             max_datapoints=max_datapoints,
             min_samples=cls._MIN_SAMPLES_FOR_TSNE,
         )
+        if plot_data[0]:
+            save_plot_data_cache(cache_path, cache_key, plot_data)
+        return plot_data
 
 
 if __name__ == "__main__":
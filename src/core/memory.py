@@ -1,13 +1,99 @@
 import json
 import os
-from typing import Iterable, List
+import re
+import stat
+import tempfile
+from typing import Any, Iterable, List
 
 from data.models import Opportunity
 
+try:
+    import orjson
+except ImportError:  # orjson normally ships with the locked dependencies
+    orjson = None
+
+
+def _loads(raw: bytes) -> Any:
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
+def _dumps(data: Any) -> bytes:
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+_WHITESPACE = re.compile(r"\s*")
+
+
+def _char_at(text: str, idx: int) -> str:
+    if idx >= len(text):
+        raise json.JSONDecodeError("Unexpected end of data", text, idx)
+    return text[idx]
+
+
+def _first_items(text: str, n: int) -> list:
+    """
+    Decode only the first `n` elements of a top-level JSON array, leaving the rest of the text unparsed.
+    Raises json.JSONDecodeError if the array is malformed or ends before `n` elements or its closing bracket.
+    """
+    decoder = json.JSONDecoder()
+    idx = _WHITESPACE.match(text, 0).end()
+    if idx == len(text):
+        return []
+    if text[idx] != "[":
+        return _loads(text.encode("utf-8"))[:n]
+    items: list = []
+    idx += 1
+    while len(items) < n:
+        idx = _WHITESPACE.match(text, idx).end()
+        if _char_at(text, idx) == "]":
+            break
+        if items:
+            if text[idx] != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", text, idx)
+            idx = _WHITESPACE.match(text, idx + 1).end()
+        item, idx = decoder.raw_decode(text, idx)
+        items.append(item)
+    return items
+
+
+# Read once at import: the umask can only be queried by changing it, which would race with other threads.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _file_mode(filename: str) -> int:
+    """
+    Permission bits the written file should keep: the existing file's, or the umask default for a new one.
+    """
+    try:
+        return stat.S_IMODE(os.stat(filename).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def _atomic_write(filename: str, payload: bytes) -> None:
+    """
+    Write via a temp file in the same directory + os.replace, so readers never see a partial file.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".memory-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(payload)
+        # mkstemp creates the file as 0600; don't let the replace tighten memory.json's permissions.
+        os.chmod(tmp_path, _file_mode(filename))
+        os.replace(tmp_path, filename)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
 
 class MemoryStore:
     """
     Handles persistence of surfaced opportunities to a JSON file (default: memory.json).
+    Uses orjson for (de)serialization when available, falling back to the stdlib json module.
     """
 
     def __init__(self, filename: str = "memory.json"):
@@ -15,26 +101,23 @@ class MemoryStore:
 
     def read(self) -> List[Opportunity]:
         if os.path.exists(self.filename):
-            with open(self.filename, "r") as file:
-                data = json.load(file)
+            with open(self.filename, "rb") as file:
+                data = _loads(file.read())
             return [Opportunity(**item) for item in data]
         return []
 
     def write(self, opportunities: Iterable[Opportunity]) -> None:
-        data = [opportunity.model_dump() for opportunity in opportunities]
-        with open(self.filename, "w") as file:
-            json.dump(data, file, indent=2)
+        data = [opportunity.model_dump(mode="json") for opportunity in opportunities]
+        _atomic_write(self.filename, _dumps(data))
 
     def reset_keep_first(self, n: int = 2) -> None:
         """
         Truncate the memory file to the first N items.
         Useful for demo/dev runs to keep context small.
+        Only the first N entries are decoded; the rest of the file is never parsed.
         """
         data = []
         if os.path.exists(self.filename):
-            with open(self.filename, "r") as file:
-                data = json.load(file)
-        truncated = data[:n]
-        with open(self.filename, "w") as file:
-            json.dump(truncated, file, indent=2)
-
+            with open(self.filename, "r", encoding="utf-8") as file:
+                data = _first_items(file.read(), n)
+        _atomic_write(self.filename, _dumps(data))
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional, Self
+from typing import Any, Iterator, Optional, Self
 
 from datasets import Dataset, DatasetDict, load_dataset
 from pydantic import BaseModel, Field
@@ -88,13 +88,35 @@ class Item(BaseModel):
             }
         ).push_to_hub(dataset_name)
 
+    @classmethod
+    def from_rows(cls, dataset: Dataset) -> list[Self]:
+        """
+        Build Items from a dataset split in bulk.
+        Rows come from datasets written by `push_to_hub`, whose schema already matches Item,
+        so per-row validation is skipped (`model_construct`) after one Arrow -> Python conversion.
+        """
+        return [cls.model_construct(**row) for row in dataset.to_list()]
+
+    @staticmethod
+    def iter_column_batches_from_hub(
+        dataset_name: str, split: str = "train", batch_size: int = 1000, max_items: Optional[int] = None
+    ) -> Iterator[dict[str, list[Any]]]:
+        """
+        Stream one split from HuggingFace Hub as column batches ({"summary": [...], "price": [...], ...}).
+        Skips building an Item per row, for bulk paths such as vector DB ingestion.
+        """
+        ds = load_dataset(dataset_name, split=split, streaming=True)
+        if max_items is not None:
+            ds = ds.take(max_items)
+        yield from ds.iter(batch_size=batch_size)
+
     @classmethod
     def from_hub(cls, dataset_name: str) -> tuple[list[Self], list[Self], list[Self]]:
         """Load from HuggingFace Hub and reconstruct Items"""
         ds = load_dataset(dataset_name)
         return (
-            [cls.model_validate(row) for row in ds["train"]],
-            [cls.model_validate(row) for row in ds["validation"]],
-            [cls.model_validate(row) for row in ds["test"]],
+            cls.from_rows(ds["train"]),
+            cls.from_rows(ds["validation"]),
+            cls.from_rows(ds["test"]),
         )
 
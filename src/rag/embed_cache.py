@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "deals2buy" / "embeddings.sqlite"
+
+# Stay well below SQLite's bound-parameter limit when batch-selecting keys.
+_SELECT_CHUNK = 900
+
+
+class EmbeddingCache:
+    """
+    On-disk embedding cache (SQLite) keyed by a content hash of (model_name, text).
+
+    Re-running ingestion turns a transformer forward pass into a row lookup. Entries are never evicted:
+    the file grows with the set of distinct texts embedded through it (ingested summaries; queries use the
+    bounded in-memory QueryEmbeddingCache instead), and deleting it simply resets the cache.
+    Vectors are stored as float32 by default; dtype="float16" halves the file size (MiniLM cosine
+    similarities stay within ~1e-3) and vectors are upcast to float32 on read.
+
+    The cache is best-effort: a read or write failure (e.g. "database is locked") is logged once and
+    treated as a miss / skipped write, so embedding never fails because of it.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_CACHE_PATH, dtype: str = "float32"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float16):
+            raise ValueError(f"Unsupported embedding cache dtype: {dtype}")
+        # One table per storage dtype, so switching dtype never misreads existing rows.
+        self._table = "embeddings" if self.dtype == np.float32 else f"embeddings_{self.dtype.name}"
+        self._lock = threading.Lock()
+        self._warned = False
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self._table} (key BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+            )
+
+    def _warn_once(self, action: str, error: Exception) -> None:
+        if not self._warned:
+            self._warned = True
+            logger.warning("Embedding cache %s failed at %s (%s); encoding without it.", action, self.path, error)
+
+    @staticmethod
+    def key(model_name: str, text: str) -> bytes:
+        return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).digest()
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        found: Dict[bytes, np.ndarray] = {}
+        unique = list(dict.fromkeys(keys))
+        try:
+            with self._lock:
+                for i in range(0, len(unique), _SELECT_CHUNK):
+                    chunk = unique[i : i + _SELECT_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT key, vec FROM {self._table} WHERE key IN ({placeholders})", chunk
+                    ).fetchall()
+                    for key, vec in rows:
+                        # Zero-copy view for float32 storage; float16 is upcast.
+                        found[key] = np.frombuffer(vec, dtype=self.dtype).astype(np.float32, copy=False)
+        except sqlite3.Error as error:
+            self._warn_once("read", error)
+            return {}
+        return found
+
+    def put_many(self, items: Iterable[Tuple[bytes, np.ndarray]]) -> None:
+        rows = [(key, np.asarray(vector, dtype=self.dtype).tobytes()) for key, vector in items]
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany(f"INSERT OR IGNORE INTO {self._table} (key, vec) VALUES (?, ?)", rows)
+        except sqlite3.Error as error:
+            self._warn_once("write", error)
+
+
+@lru_cache(maxsize=1)
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """
+    Process-wide cache at EMBED_CACHE_PATH (default ~/.cache/deals2buy/embeddings.sqlite),
+    stored as EMBED_CACHE_DTYPE (float32 or float16). Set EMBED_CACHE=0 to disable.
+    Returns None (no caching) if the cache file cannot be opened.
+    """
+    if os.getenv("EMBED_CACHE", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    path = os.getenv("EMBED_CACHE_PATH") or DEFAULT_CACHE_PATH
+    try:
+        return EmbeddingCache(path, dtype=os.getenv("EMBED_CACHE_DTYPE", "float32").strip().lower())
+    except (OSError, sqlite3.Error) as error:
+        logger.warning("Embedding cache unavailable at %s (%s); encoding without it.", path, error)
+        return None
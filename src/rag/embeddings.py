@@ -1,22 +1,254 @@
 from __future__ import annotations
 
+import os
+import platform
 from functools import lru_cache
-from typing import Iterable, List
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
 
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
+from tqdm import tqdm
+
+from rag.embed_cache import get_embedding_cache
 
 
 DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 
+# Exported INT8 ONNX models live here, one subdirectory per source model (src/rag/embeddings.py -> repo root).
+ONNX_INT8_CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "onnx-minilm-int8"
+
+# Texts are cut to this many characters before tokenization. MiniLM only sees its first 256 tokens
+# anyway, and 2048 chars is comfortably past that for English text, so embeddings are unchanged.
+MAX_ENCODE_CHARS = 2048
+
+# Max padded tokens (batch rows x longest sequence) per forward pass when RAG_DYNAMIC_BATCH=1.
+DYNAMIC_BATCH_TOKEN_BUDGET = 8192
+
+
+def _resolve_dtype(dtype: Optional[str]) -> Optional[str]:
+    if dtype == "auto":
+        if not torch.cuda.is_available():
+            return None
+        return "bfloat16" if torch.cuda.is_bf16_supported() else "float16"
+    return dtype
+
+
+def cast_encoder(encoder: SentenceTransformer, dtype: Optional[str] = "auto") -> SentenceTransformer:
+    """
+    Cast encoder weights to a lower precision for faster inference.
+
+    "auto" picks bf16 on GPUs that support it (fp16 otherwise) and keeps FP32 on CPU,
+    where half precision is slower. Pass e.g. "float16" to force a dtype, or None to keep weights as loaded.
+    """
+    dtype = _resolve_dtype(dtype)
+    if dtype is None:
+        return encoder
+    return encoder.to(dtype=getattr(torch, dtype))
+
+
+def _available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS/Windows
+        return os.cpu_count() or 4
+
+
+@lru_cache(maxsize=1)
+def configure_torch_threads() -> int:
+    """
+    Size PyTorch's CPU thread pools once per process (TORCH_NUM_THREADS, default: available cores).
+    Some container environments otherwise leave CPU inference on a single intra-op thread.
+    torch.set_num_threads resizes torch's own OpenMP/MKL pools at runtime; OMP_NUM_THREADS and
+    MKL_NUM_THREADS are only read when those runtimes load, so they are left to the launching shell.
+    Returns the intra-op thread count in effect.
+    """
+    if torch.cuda.is_available():
+        return torch.get_num_threads()
+    n = int(os.getenv("TORCH_NUM_THREADS") or _available_cpus())
+    torch.set_num_threads(n)
+    try:
+        torch.set_num_interop_threads(2)
+    except RuntimeError:
+        # Only settable before any inter-op parallel work has started in this process.
+        pass
+    return n
+
+
+def _onnx_model_kwargs() -> dict:
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # Same budget as PyTorch (TORCH_NUM_THREADS / CPU affinity), so pinned containers aren't oversubscribed.
+    options.intra_op_num_threads = configure_torch_threads()
+    return {"provider": "CPUExecutionProvider", "session_options": options}
+
+
+def _int8_quantization_config() -> str:
+    # VNNI int8 GEMMs on x86 (ONNX Runtime falls back to plain AVX2/AVX-512 kernels without VNNI).
+    return "arm64" if platform.machine().lower() in ("arm64", "aarch64") else "avx512_vnni"
+
+
+def _load_onnx_int8_encoder(model_name: str) -> SentenceTransformer:
+    """
+    Load an INT8 dynamically quantized ONNX export of `model_name`, exporting it on first use.
+    The export is cached under ONNX_INT8_CACHE_DIR and reloaded from there on later runs.
+    """
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    config = _int8_quantization_config()
+    file_name = f"onnx/model_qint8_{config}.onnx"
+    local_path = ONNX_INT8_CACHE_DIR / model_name.replace("/", "__")
+    if not (local_path / file_name).exists():
+        encoder = SentenceTransformer(model_name, backend="onnx")
+        encoder.save(str(local_path))
+        export_dynamic_quantized_onnx_model(encoder, config, str(local_path))
+    model_kwargs = {**_onnx_model_kwargs(), "file_name": file_name}
+    return SentenceTransformer(str(local_path), backend="onnx", model_kwargs=model_kwargs)
+
 
 @lru_cache(maxsize=4)
-def get_encoder(model_name: str = DEFAULT_EMBEDDING_MODEL) -> SentenceTransformer:
-    return SentenceTransformer(model_name)
+def _load_encoder(model_name: str, dtype: Optional[str], backend: str) -> SentenceTransformer:
+    configure_torch_threads()
+    if backend == "onnx-int8":
+        return _load_onnx_int8_encoder(model_name)
+    if backend == "onnx":
+        # ONNX Runtime with full graph optimizations is several times faster than eager PyTorch on CPU.
+        # Requires the `onnx` extra of sentence-transformers (optimum + onnxruntime).
+        return SentenceTransformer(model_name, backend="onnx", model_kwargs=_onnx_model_kwargs())
+    return cast_encoder(SentenceTransformer(model_name), dtype)
+
+
+def get_encoder(
+    model_name: str = DEFAULT_EMBEDDING_MODEL,
+    dtype: Optional[str] = "auto",
+    backend: Optional[str] = None,
+) -> SentenceTransformer:
+    """
+    Return a cached encoder. `backend` is "torch" (default), "onnx" or "onnx-int8";
+    when omitted it is read from EMBED_BACKEND.
+    """
+    return _load_encoder(model_name, dtype, _embed_backend(backend))
+
+
+def _embed_backend(backend: Optional[str] = None) -> str:
+    return (backend or os.getenv("EMBED_BACKEND", "torch")).strip().lower()
+
+
+def _cache_namespace(model_name: str) -> str:
+    # Quantized and half-precision vectors differ slightly from FP32 ones, so they get their own
+    # embedding-cache entries. The dtype is the one _encode's get_encoder(model_name) call resolves to.
+    backend = _embed_backend()
+    if backend == "onnx-int8":
+        return f"{model_name}#int8"
+    dtype = _resolve_dtype("auto") if backend == "torch" else None
+    return f"{model_name}#{dtype}" if dtype else model_name
+
+
+def _dynamic_batching_enabled() -> bool:
+    return os.getenv("RAG_DYNAMIC_BATCH", "0").strip().lower() in ("1", "true", "yes", "on")
 
 
-def embed_texts(texts: Iterable[str], model_name: str = DEFAULT_EMBEDDING_MODEL) -> np.ndarray:
+def token_budget_batches(lengths: Sequence[int], token_budget: int = DYNAMIC_BATCH_TOKEN_BUDGET) -> List[List[int]]:
+    """
+    Group text indices, longest first, so every batch's padded size (rows x longest sequence)
+    stays within `token_budget`. Similar lengths end up together, so little compute goes to padding.
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_max = 0
+    for idx in np.argsort([-length for length in lengths], kind="stable"):
+        length = max(int(lengths[idx]), 1)
+        if current and max(current_max, length) * (len(current) + 1) > token_budget:
+            batches.append(current)
+            current, current_max = [], 0
+        current.append(int(idx))
+        current_max = max(current_max, length)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _encode_dynamic(encoder: SentenceTransformer, texts: List[str], show_progress_bar: bool) -> np.ndarray:
+    """
+    Encode with batches sized by a token budget instead of a fixed row count.
+
+    Texts are tokenized once up front; each batch pads its slice of those ids and runs the
+    model's forward pass directly rather than re-tokenizing inside SentenceTransformer.encode.
+    """
+    # Mirror SentenceTransformers' own text preprocessing before tokenization.
+    texts = [text.strip() for text in texts]
+    if getattr(encoder[0], "do_lower_case", False):
+        texts = [text.lower() for text in texts]
+    tokenized = encoder.tokenizer(texts, padding=False, truncation=True, max_length=encoder.max_seq_length)
+    lengths = [len(ids) for ids in tokenized["input_ids"]]
+
+    encoder.eval()
+    vectors: Optional[np.ndarray] = None
+    with torch.inference_mode():
+        for batch in tqdm(token_budget_batches(lengths), disable=not show_progress_bar):
+            features = encoder.tokenizer.pad(
+                {key: [tokenized[key][i] for i in batch] for key in tokenized.keys()},
+                padding=True,
+                return_tensors="pt",
+            )
+            features = {key: value.to(encoder.device) for key, value in features.items()}
+            encoded = encoder(features)["sentence_embedding"].float().cpu().numpy()
+            if vectors is None:
+                vectors = np.empty((len(texts), encoded.shape[1]), dtype=np.float32)
+            vectors[batch] = encoded
+    return vectors
+
+
+def _encode(
+    texts: List[str], model_name: str, batch_size: int, show_progress_bar: bool
+) -> np.ndarray:
     encoder = get_encoder(model_name)
-    vectors = encoder.encode(list(texts))
+    texts = [text[:MAX_ENCODE_CHARS] for text in texts]
+    if texts and _dynamic_batching_enabled():
+        return _encode_dynamic(encoder, texts, show_progress_bar)
+    vectors = encoder.encode(
+        texts,
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        show_progress_bar=show_progress_bar,
+    )
     return np.asarray(vectors)
 
+
+def embed_texts(
+    texts: Iterable[str],
+    model_name: str = DEFAULT_EMBEDDING_MODEL,
+    *,
+    batch_size: int = 32,
+    show_progress_bar: bool = False,
+    use_cache: bool = True,
+) -> np.ndarray:
+    """
+    Embed texts, reusing vectors from the on-disk embedding cache and encoding only the misses.
+    Returns an array shaped (len(texts), dim) in input order.
+    """
+    texts = list(texts)
+    cache = get_embedding_cache() if use_cache else None
+    if cache is None or not texts:
+        return _encode(texts, model_name, batch_size, show_progress_bar)
+
+    namespace = _cache_namespace(model_name)
+    keys = [cache.key(namespace, text) for text in texts]
+    cached = cache.get_many(keys)
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+    encoded = _encode([texts[i] for i in missing], model_name, batch_size, show_progress_bar) if missing else None
+
+    # Fill one preallocated (n, dim) buffer instead of stacking per-row arrays.
+    dim = encoded.shape[1] if encoded is not None else len(next(iter(cached.values())))
+    vectors = np.empty((len(texts), dim), dtype=np.float32)
+    for i, key in enumerate(keys):
+        hit = cached.get(key)
+        if hit is not None:
+            vectors[i] = hit
+    if missing:
+        vectors[missing] = encoded
+        cache.put_many((keys[i], vector) for i, vector in zip(missing, encoded))
+    return vectors
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+DEFAULT_CACHE_SIZE = 4096
+
+
+class QueryEmbeddingCache:
+    """
+    Thread-safe in-process LRU cache for query embeddings.
+
+    Entries are keyed by (model_name, sha256(text)) so repeated deal descriptions
+    skip the transformer forward pass entirely.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Tuple[str, str], np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model_name: str, text: str) -> Tuple[str, str]:
+        return model_name, hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, model_name: str, text: str) -> Optional[np.ndarray]:
+        key = self.key(model_name, text)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            return vector
+
+    def put(self, model_name: str, text: str, vector: np.ndarray) -> None:
+        if self.maxsize <= 0:
+            return
+        vector = np.array(vector)
+        vector.setflags(write=False)
+        key = self.key(model_name, text)
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@lru_cache(maxsize=1)
+def get_query_cache() -> QueryEmbeddingCache:
+    """
+    Process-wide cache shared by all retrievers. Size is tunable via QUERY_CACHE_SIZE (0 disables).
+    """
+    return QueryEmbeddingCache(int(os.getenv("QUERY_CACHE_SIZE", str(DEFAULT_CACHE_SIZE))))
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, List, Tuple
 
+import numpy as np
+
 from rag.embeddings import embed_texts, DEFAULT_EMBEDDING_MODEL
+from rag.query_cache import QueryEmbeddingCache, get_query_cache
 
 
 @dataclass
@@ -14,14 +17,43 @@ class ChromaRetriever:
 
     collection: Any
     embedding_model: str = DEFAULT_EMBEDDING_MODEL
+    cache: QueryEmbeddingCache = field(default_factory=get_query_cache)
+
+    def embed_queries(self, descriptions: List[str]) -> np.ndarray:
+        """
+        Embed descriptions, serving repeats from the cache and encoding all misses in one call.
+        """
+        vectors = [self.cache.get(self.embedding_model, description) for description in descriptions]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            # Queries are cached in the bounded in-memory LRU only, not the ever-growing on-disk cache.
+            embedded = embed_texts(
+                [descriptions[i] for i in missing], model_name=self.embedding_model, use_cache=False
+            )
+            for i, vector in zip(missing, embedded):
+                self.cache.put(self.embedding_model, descriptions[i], vector)
+                vectors[i] = vector
+        return np.vstack(vectors)
 
     def query_similars(self, description: str, n_results: int = 5) -> Tuple[List[str], List[float]]:
-        vector = embed_texts([description], model_name=self.embedding_model)
+        return self.query_similars_batch([description], n_results=n_results)[0]
+
+    def query_similars_batch(
+        self, descriptions: List[str], n_results: int = 5
+    ) -> List[Tuple[List[str], List[float]]]:
+        """
+        Look up similar products for several descriptions with a single encode and a single Chroma query.
+        """
+        if not descriptions:
+            return []
+        vectors = self.embed_queries(descriptions)
         results = self.collection.query(
-            query_embeddings=vector.astype(float).tolist(),
+            query_embeddings=vectors.astype(np.float32),
             n_results=n_results,
+            # Only documents and prices are used; skip distances/embeddings in the response.
+            include=["documents", "metadatas"],
         )
-        documents = results["documents"][0][:]
-        prices = [m["price"] for m in results["metadatas"][0][:]]
-        return documents, prices
-
+        return [
+            (documents[:], [m["price"] for m in metadatas])
+            for documents, metadatas in zip(results["documents"], results["metadatas"])
+        ]
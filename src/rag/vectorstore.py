@@ -2,7 +2,7 @@
 Build/populate the persistent Chroma vector DB used by the Gradio UI plot.
 
 This mirrors the Day 2 notebook flow (simplified):
-- load dataset (items_lite / items_full)
+- stream the train split of the dataset (items_lite / items_full)
 - embed item summaries with SentenceTransformer all-MiniLM-L6-v2
 - store into Chroma PersistentClient at DB path: products_vectorstore, collection: "products"
 
@@ -22,13 +22,14 @@ import argparse
 import logging
 import os
 import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, TypeVar
 
 import chromadb
 import numpy as np
 from dotenv import load_dotenv
-from sentence_transformers import SentenceTransformer
 from tqdm import tqdm
 
 # This repo uses a simple "src/" layout (not an installed package).
@@ -39,11 +40,16 @@ if str(_SRC_DIR) not in sys.path:
 
 from data.models import Item  # noqa: E402
 from core.framework import DealAgentFramework  # noqa: E402
+from rag.embeddings import configure_torch_threads, embed_texts  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_COLLECTION = "products"
 DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+# Rows per collection.add(); clamped to the client's own limit.
+DEFAULT_INSERT_BATCH_SIZE = 10_000
+
+T = TypeVar("T")
 
 
 def _repo_root() -> Path:
@@ -60,17 +66,32 @@ def _db_path() -> str:
     return str(db if db.is_absolute() else (_repo_root() / db))
 
 
-def _collection_count(collection) -> int:
+def _prefetch(iterator: Iterator[T], depth: int = 2) -> Iterator[T]:
+    """
+    Pull items from `iterator` on a background thread, keeping up to `depth` ready ahead of the consumer.
+    Overlaps dataset download/decoding with embedding + Chroma inserts.
+    """
+    done = object()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = deque(executor.submit(next, iterator, done) for _ in range(depth))
+        while True:
+            item = pending.popleft().result()
+            if item is done:
+                return
+            pending.append(executor.submit(next, iterator, done))
+            yield item
+
+
+def _add_to_collection(collection, *, ids, documents, embeddings: np.ndarray, metadatas) -> None:
+    """
+    Pass embeddings to Chroma as a float32 ndarray, avoiding N x dim Python float objects.
+    Never widen to float64: the fallback only converts the float32 array to lists.
+    """
     try:
-        return int(collection.count())
-    except Exception:
-        # Fallback for older Chroma / edge cases
-        try:
-            result = collection.get(limit=1)
-            ids = result.get("ids") or []
-            return 0 if len(ids) == 0 else 1
-        except Exception:
-            return 0
+        collection.add(ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas)
+    except (TypeError, ValueError):
+        # Older Chroma clients only accept nested lists of floats.
+        collection.add(ids=ids, documents=documents, embeddings=embeddings.tolist(), metadatas=metadatas)
 
 
 def build_products_vectordb(
@@ -79,7 +100,8 @@ def build_products_vectordb(
     min_required: int = DealAgentFramework._MIN_SAMPLES_FOR_TSNE,
     force_recreate: bool = False,
     max_items: Optional[int] = None,
-    batch_size: int = 1000,
+    batch_size: Optional[int] = None,
+    encode_batch_size: int = 64,
     collection_name: str = DEFAULT_COLLECTION,
     model_name: str = DEFAULT_MODEL,
 ) -> int:
@@ -87,8 +109,17 @@ def build_products_vectordb(
     Build (or extend) the Chroma collection so it has at least `min_required` items.
 
     This follows the Day 2 notebook logic closely:
+    - items are streamed from the dataset as column batches of `batch_size` rows (never fully
+      materialized, no per-row Item objects; default: DEFAULT_INSERT_BATCH_SIZE clamped to the
+      largest batch the client accepts, so each chunk is one big collection.add transaction)
     - documents = item.summary
-    - vectors = encoder.encode(documents).astype(float).tolist()
+    - vectors = embed_texts(documents) once per chunk (SentenceTransformers batches internally,
+      sorting by length to minimize padding; `encode_batch_size` controls the model batch).
+      Previously embedded summaries are served from the on-disk embedding cache.
+      On CPU, EMBED_BACKEND=onnx-int8 runs an INT8-quantized ONNX export of the model instead.
+    - inserts run on a writer thread, overlapping each chunk's insert with the next chunk's encode
+    - vectors are handed to Chroma as a contiguous float32 ndarray (no .tolist() round-trip);
+      the collection stores FP32, the same layout as Chroma's HNSW index, so nothing is converted on insert
     - metadatas = {"category": item.category, "price": item.price}
     - ids = doc_0..doc_N
     """
@@ -102,42 +133,63 @@ def build_products_vectordb(
             pass
 
     collection = client.get_or_create_collection(collection_name)
-    existing = _collection_count(collection)
+    existing = collection.count()
     if existing >= min_required and not force_recreate:
         logger.info("Vector DB already populated: %s items (>= %s).", existing, min_required)
         return existing
 
-    logger.info("Loading dataset: %s", dataset)
-    train, _val, _test = Item.from_hub(dataset)
-    if max_items is not None:
-        train = train[:max_items]
+    # Chroma caps a single add() at get_max_batch_size() records.
+    batch_size = min(batch_size or DEFAULT_INSERT_BATCH_SIZE, client.get_max_batch_size())
 
-    logger.info("Loading embedding model: %s", model_name)
-    encoder = SentenceTransformer(model_name)
+    logger.info("Streaming dataset: %s", dataset)
+    batches = Item.iter_column_batches_from_hub(
+        dataset, split="train", batch_size=batch_size, max_items=max_items
+    )
 
     # If appending (not recreating), start IDs after the current count to avoid collisions.
     id_start = 0 if force_recreate else max(existing, 0)
 
+    # Size the CPU thread pools before the first encode (some containers default to a single thread).
+    threads = configure_torch_threads()
     logger.info(
-        "Ingesting %s items into Chroma (%s, collection=%s, batch_size=%s)...",
-        len(train),
+        "Ingesting items into Chroma (%s, collection=%s, batch_size=%s, model=%s, torch_threads=%s)...",
         db_path,
         collection_name,
         batch_size,
+        model_name,
+        threads,
     )
-    for i in tqdm(range(0, len(train), batch_size)):
-        batch = train[i : i + batch_size]
-        documents = [item.summary for item in batch]
-        vectors = encoder.encode(documents)
-        vectors = np.asarray(vectors).astype(float).tolist()
-        metadatas = [{"category": item.category, "price": item.price} for item in batch]
-
-        ids = [f"doc_{j}" for j in range(id_start + i, id_start + i + batch_size)]
-        ids = ids[: len(documents)]
-
-        collection.add(ids=ids, documents=documents, embeddings=vectors, metadatas=metadatas)
-
-    final_count = _collection_count(collection)
+    ingested = 0
+    # Chroma writes run on their own thread: chunk N is inserted while chunk N+1 is being encoded.
+    # At most one insert is in flight, and waiting on it re-raises any insert error here.
+    pending_write: Optional[Future] = None
+    with tqdm(total=max_items, unit="items") as progress, ThreadPoolExecutor(max_workers=1) as writer:
+        for columns in _prefetch(batches):
+            documents = columns["summary"]
+            # Served from the on-disk embedding cache on re-runs; only new summaries hit the model.
+            vectors = embed_texts(documents, model_name=model_name, batch_size=encode_batch_size)
+            metadatas = [
+                {"category": category, "price": price}
+                for category, price in zip(columns["category"], columns["price"])
+            ]
+            ids = [f"doc_{j}" for j in range(id_start + ingested, id_start + ingested + len(documents))]
+            if pending_write is not None:
+                pending_write.result()
+            pending_write = writer.submit(
+                _add_to_collection,
+                collection,
+                ids=ids,
+                documents=documents,
+                embeddings=np.ascontiguousarray(vectors, dtype=np.float32),
+                metadatas=metadatas,
+            )
+            ingested += len(documents)
+            progress.update(len(documents))
+        if pending_write is not None:
+            pending_write.result()
+
+    # IDs are contiguous from id_start, so the final size is known without another count().
+    final_count = id_start + ingested
     logger.info("Vector DB ready: %s items in '%s'.", final_count, collection_name)
     return final_count
 
@@ -148,6 +200,7 @@ def ensure_products_vectordb(
     min_required: int = DealAgentFramework._MIN_SAMPLES_FOR_TSNE,
     max_items: Optional[int] = None,
     force_recreate: bool = False,
+    encode_batch_size: int = 64,
 ) -> int:
     """
     Convenience wrapper used by `src/main.py`.
@@ -160,6 +213,7 @@ def ensure_products_vectordb(
         min_required=min_required,
         force_recreate=force_recreate,
         max_items=max_items,
+        encode_batch_size=encode_batch_size,
     )
 
 
@@ -175,7 +229,12 @@ def _parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
         help="Minimum items needed (TSNE needs >30).",
     )
     p.add_argument("--max-items", type=int, default=None, help="Optionally cap ingested items.")
-    p.add_argument("--batch-size", type=int, default=1000, help="Ingestion batch size.")
+    p.add_argument(
+        "--batch-size",
+        type=int,
+        default=64,
+        help="Embedding (encode) batch size; Chroma inserts use their own, larger chunks.",
+    )
     return p.parse_args(argv)
 
 
@@ -190,6 +249,7 @@ def main(argv: Optional[list[str]] = None) -> int:
         min_required=args.min_required,
         max_items=args.max_items,
         force_recreate=args.force,
+        encode_batch_size=args.batch_size,
     )
     if count < args.min_required:
         logger.warning("Only %s items in vector DB; UI plot needs >= %s.", count, args.min_required)
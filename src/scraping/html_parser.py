@@ -2,20 +2,41 @@ import re
 
 from bs4 import BeautifulSoup
 
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # optional; BeautifulSoup's html.parser is the fallback
+    HTMLParser = None
 
-def extract_deal_snippet(html_snippet: str) -> str:
-    """
-    Clean up the RSS HTML snippet and extract useful plain text.
-    """
+_TAG_RE = re.compile(r"<[^<]+?>")
+
+
+def _snippet_text_bs4(html_snippet: str) -> str:
     soup = BeautifulSoup(html_snippet, "html.parser")
     snippet_div = soup.find("div", class_="snippet summary")
 
     if snippet_div:
         description = snippet_div.get_text(strip=True)
         description = BeautifulSoup(description, "html.parser").get_text()
-        description = re.sub("<[^<]+?>", "", description)
-        result = description.strip()
+        description = _TAG_RE.sub("", description)
+        return description.strip()
+    return html_snippet
+
+
+def _snippet_text_selectolax(html_snippet: str) -> str:
+    # One pass with the lexbor-backed parser; the regex only catches escaped markup left in the text.
+    node = HTMLParser(html_snippet).css_first("div.snippet.summary")
+    if node is None:
+        return html_snippet
+    return _TAG_RE.sub("", node.text(strip=True)).strip()
+
+
+def extract_deal_snippet(html_snippet: str) -> str:
+    """
+    Clean up the RSS HTML snippet and extract useful plain text.
+    Uses selectolax when installed (much faster), otherwise BeautifulSoup.
+    """
+    if HTMLParser is not None:
+        result = _snippet_text_selectolax(html_snippet)
     else:
-        result = html_snippet
+        result = _snippet_text_bs4(html_snippet)
     return result.replace("\n", " ")
-
@@ -1,15 +1,26 @@
 from __future__ import annotations
 
-import time
-from typing import Dict, List, Self
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Self
 
 import feedparser
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from tqdm import tqdm
 
 from scraping.html_parser import extract_deal_snippet
 
+try:
+    from lxml import etree
+except ImportError:  # optional; feedparser handles the feeds without it
+    etree = None
+
+logger = logging.getLogger(__name__)
+
 feeds = [
     "https://www.dealnews.com/c142/Electronics/?rss=1",
     "https://www.dealnews.com/c39/Computers/?rss=1",
@@ -19,6 +30,56 @@ feeds = [
 # You could also add: "https://www.dealnews.com/c238/Automotive/?rss=1"
 # "https://www.dealnews.com/c196/Home-Garden/?rss=1"
 
+# (connect, read) seconds for feed and deal-page downloads, so one slow host cannot stall a scan
+REQUEST_TIMEOUT = (3.05, 10)
+
+# Deal pages fetched concurrently (and pooled connections kept open) per fetch().
+MAX_PAGE_FETCHES = 16
+
+
+@lru_cache(maxsize=1)
+def _session() -> requests.Session:
+    """
+    Shared HTTP session so feed and deal-page requests reuse TCP/TLS connections to dealnews.com,
+    retrying connection errors and transient 429/5xx responses.
+    """
+    session = requests.Session()
+    retries = Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=MAX_PAGE_FETCHES, pool_maxsize=MAX_PAGE_FETCHES, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _parse_feed_lxml(content: bytes) -> List[Dict]:
+    # Entity resolution and network access are off: the feed is untrusted input.
+    parser = etree.XMLParser(resolve_entities=False, no_network=True)
+    root = etree.fromstring(content, parser)
+    return [
+        {
+            "title": item.findtext("title", default=""),
+            "summary": item.findtext("description", default=""),
+            "links": [{"href": (item.findtext("link") or "").strip()}],
+        }
+        for item in root.iter("item")
+    ]
+
+
+def parse_feed(content: bytes) -> List[Dict]:
+    """
+    Parse RSS bytes into feedparser-shaped entries (title, summary, links[0]["href"]).
+    Uses lxml for plain RSS 2.0 when installed. Malformed XML, feeds without RSS 2.0 <item> elements
+    (Atom, namespaced RSS 1.0) and missing lxml all fall back to feedparser.
+    """
+    if etree is not None:
+        try:
+            entries = _parse_feed_lxml(content)
+        except etree.XMLSyntaxError:
+            entries = []
+        if entries:
+            return entries
+    return feedparser.parse(content).entries
+
 
 class ScrapedDeal:
     """
@@ -32,12 +93,16 @@ class ScrapedDeal:
     details: str
     features: str
 
-    def __init__(self, entry: Dict[str, str]):
+    def __init__(self, entry: Dict[str, str], page: Optional[bytes] = None):
+        """
+        Build a deal from an RSS entry. `page` is the already-fetched deal page; it is fetched here when omitted.
+        """
         self.title = entry["title"]
         self.summary = extract_deal_snippet(entry["summary"])
         self.url = entry["links"][0]["href"]
-        stuff = requests.get(self.url).content
-        soup = BeautifulSoup(stuff, "html.parser")
+        if page is None:
+            page = self._fetch_page(self.url)
+        soup = BeautifulSoup(page, "html.parser")
         content = soup.find("div", class_="content-section").get_text()
         content = content.replace("\nmore", "").replace("\n", " ")
         if "Features" in content:
@@ -66,17 +131,30 @@ class ScrapedDeal:
             f"Title: {self.title}\nDetails: {self.details.strip()}\nFeatures: {self.features.strip()}\nURL: {self.url}"
         )
 
+    @classmethod
+    def _fetch_page(cls, url: str) -> bytes:
+        return _session().get(url, timeout=REQUEST_TIMEOUT).content
+
     @classmethod
     def fetch(cls, show_progress: bool = False) -> List[Self]:
         """
         Retrieve all deals from the selected RSS feeds.
+
+        Feeds are parsed one after another; the deal pages they link to are then fetched concurrently.
+        A feed that cannot be downloaded (connection error, timeout, non-2xx response) is logged and skipped.
         """
-        deals: list[ScrapedDeal] = []
+        entries = []
         feed_iter = tqdm(feeds) if show_progress else feeds
         for feed_url in feed_iter:
-            feed = feedparser.parse(feed_url)
-            for entry in feed.entries[:10]:
-                deals.append(cls(entry))
-                time.sleep(0.05)
-        return deals
+            try:
+                response = _session().get(feed_url, timeout=REQUEST_TIMEOUT)
+                response.raise_for_status()
+            except requests.RequestException as error:
+                logger.warning("Skipping feed %s: %s", feed_url, error)
+                continue
+            entries.extend(parse_feed(response.content)[:10])
 
+        urls = [entry["links"][0]["href"] for entry in entries]
+        with ThreadPoolExecutor(max_workers=MAX_PAGE_FETCHES) as executor:
+            pages = list(executor.map(cls._fetch_page, urls))
+        return [cls(entry, page) for entry, page in zip(entries, pages)]
@@ -1,24 +1,68 @@
 from __future__ import annotations
 
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import ClassVar, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
+logger = logging.getLogger(__name__)
+
 PUSHOVER_URL = "https://api.pushover.net/1/messages.json"
 
+# (connect, read) seconds
+PUSHOVER_TIMEOUT = (3.05, 10)
+
+# Notifications are fire-and-forget; a small pool keeps them off the agent loop.
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pushover")
+
 
 @dataclass
 class PushoverClient:
     user: str
     token: str
 
-    def send(self, message: str, *, sound: str = "cashregister") -> None:
+    # Shared across clients so repeated notifications reuse one keep-alive connection.
+    _session: ClassVar[Optional[requests.Session]] = None
+    _session_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @classmethod
+    def session(cls) -> requests.Session:
+        with cls._session_lock:
+            if cls._session is None:
+                session = requests.Session()
+                retries = Retry(total=2, backoff_factor=0.3)
+                session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retries))
+                cls._session = session
+            return cls._session
+
+    def _post(self, payload: dict) -> None:
+        response = self.session().post(PUSHOVER_URL, data=payload, timeout=PUSHOVER_TIMEOUT)
+        response.raise_for_status()
+
+    @staticmethod
+    def _log_failure(future: Future) -> None:
+        # Callers usually drop the Future, so a failed send is reported here rather than lost.
+        error = future.exception()
+        if error is not None:
+            logger.error("Pushover notification failed: %s", error)
+
+    def send(self, message: str, *, sound: str = "cashregister") -> Future:
+        """
+        Queue a push notification and return immediately; the returned Future resolves once it is sent.
+        Failures (connection errors, non-2xx responses) are logged and re-raised by `Future.result()`.
+        """
         payload = {
             "user": self.user,
             "token": self.token,
             "message": message,
             "sound": sound,
         }
-        requests.post(PUSHOVER_URL, data=payload)
-
+        future = _executor.submit(self._post, payload)
+        future.add_done_callback(self._log_failure)
+        return future
@@ -1,17 +1,96 @@
 from __future__ import annotations
 
-from typing import Any, List, Tuple
+import importlib.util
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
 
 import numpy as np
+from sklearn.decomposition import PCA
 from sklearn.manifold import TSNE
 
 from config.constants import CATEGORIES, COLORS
 
 
+logger = logging.getLogger(__name__)
+
+
+# Bump when the projection settings change so cached plot data is recomputed.
+PROJECTION_VERSION = "v2"
+
+# 3D reducers for the UI plot, selected with DEALS_UI_REDUCER. umap/opentsne are opt-in (the `plot` extra);
+# an unavailable choice falls back to sklearn's t-SNE.
+PLOT_REDUCERS = ("umap", "opentsne", "tsne")
+DEFAULT_PLOT_REDUCER = "tsne"
+
+# Rows fetched from Chroma per collection.get() when building plot data.
+PLOT_PAGE_SIZE = 500
+
+# Dimensions kept by the PCA pre-reduction before t-SNE (standard practice; cuts neighbor-search cost).
+PCA_DIMENSIONS = 50
+
+
 def _empty_plot_tuple():
     return [], np.array([]).reshape(0, 3), []
 
 
+def _reducer_available(name: str) -> bool:
+    module = {"umap": "umap", "opentsne": "openTSNE"}.get(name)
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def plot_reducer() -> str:
+    """
+    The 3D reducer in effect: DEALS_UI_REDUCER (default: tsne) if it is installed, else "tsne".
+    """
+    name = os.getenv("DEALS_UI_REDUCER", DEFAULT_PLOT_REDUCER).strip().lower()
+    if name not in PLOT_REDUCERS or not _reducer_available(name):
+        return "tsne"
+    return name
+
+
+def _umap_3d(vectors: np.ndarray) -> np.ndarray:
+    import umap
+
+    # A fixed random_state keeps the plot stable between refreshes (UMAP then runs single-threaded).
+    reducer = umap.UMAP(n_components=3, random_state=42, n_neighbors=15, min_dist=0.1, metric="cosine")
+    return reducer.fit_transform(vectors)
+
+
+def _opentsne_3d(vectors: np.ndarray) -> np.ndarray:
+    from openTSNE import TSNE as OpenTSNE
+
+    # openTSNE's FFT gradients only support 1-2 components, so 3D uses its Barnes-Hut path.
+    tsne = OpenTSNE(
+        n_components=3,
+        negative_gradient_method="bh",
+        perplexity=min(30, max(5, vectors.shape[0] // 4)),
+        n_jobs=-1,
+        random_state=42,
+    )
+    return np.asarray(tsne.fit(vectors))
+
+
+def _tsne_3d(vectors: np.ndarray) -> np.ndarray:
+    """
+    3D t-SNE with PCA pre-reduction and PCA init, which converges in far fewer iterations than random init.
+    """
+    if vectors.shape[1] > PCA_DIMENSIONS and vectors.shape[0] > PCA_DIMENSIONS:
+        vectors = PCA(n_components=PCA_DIMENSIONS, random_state=42).fit_transform(vectors)
+    tsne = TSNE(
+        n_components=3,
+        random_state=42,
+        n_jobs=-1,
+        init="pca",
+        learning_rate="auto",
+        max_iter=500,
+        perplexity=min(30, max(5, vectors.shape[0] // 4)),
+    )
+    return tsne.fit_transform(vectors)
+
+
 def compute_tsne_plot_data(
     *,
     collection: Any,
@@ -19,35 +98,95 @@ def compute_tsne_plot_data(
     min_samples: int = 31,
 ) -> Tuple[List[str], np.ndarray, List[str]]:
     """
-    Read embeddings/documents from Chroma and compute a 3D t-SNE projection.
+    Read embeddings/documents from Chroma and compute a 3D projection (UMAP by default, see `plot_reducer`).
 
     Returns:
       documents: list[str]
       vectors: np.ndarray shaped (n, 3)
       colors: list[str] matching documents
     """
-    result = collection.get(
-        include=["embeddings", "documents", "metadatas"], limit=max_datapoints
-    )
-    embeddings = result.get("embeddings")
-    if embeddings is None:
-        return _empty_plot_tuple()
+    color_map = {cat: COLORS[i % len(COLORS)] for i, cat in enumerate(CATEGORIES)}
+    vectors: Optional[np.ndarray] = None
+    documents: List[str] = []
+    colors: List[str] = []
+    # Page through the collection so Chroma never serializes the whole result in one call.
+    # Size everything by what the collection actually holds, not the (possibly much larger) cap.
+    total = min(max_datapoints, collection.count())
+    offset = 0
+    while offset < total:
+        limit = min(PLOT_PAGE_SIZE, total - offset)
+        page = collection.get(
+            include=["embeddings", "documents", "metadatas"], limit=limit, offset=offset
+        )
+        embeddings = page.get("embeddings")
+        if embeddings is None or len(embeddings) == 0:
+            break
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if vectors is None:
+            vectors = np.empty((total, embeddings.shape[1]), dtype=np.float32)
+        vectors[offset : offset + len(embeddings)] = embeddings
+        documents.extend(page["documents"])
+        metadatas = page.get("metadatas") or []
+        if metadatas and isinstance(metadatas[0], list):
+            # Chroma format: metadatas = [[{...}, {...}, ...]]
+            metadatas = metadatas[0]
+        colors.extend(
+            color_map.get(metadata.get("category") if isinstance(metadata, dict) else None, "gray")
+            for metadata in metadatas
+        )
+        offset += len(embeddings)
+        if len(embeddings) < limit:
+            break
 
-    vectors = np.asarray(embeddings)
-    # Chroma may return []/np.array([]) for empty collections; TSNE also needs >30 samples by default.
-    if vectors.size == 0 or vectors.shape[0] < min_samples:
+    # Chroma may return nothing for empty collections; TSNE also needs >30 samples by default.
+    if vectors is None or offset < min_samples:
         return _empty_plot_tuple()
+    vectors = vectors[:offset]
 
-    documents = result["documents"]
-    categories = [metadata.get("category") for metadata in result.get("metadatas", [])]
-    if categories and isinstance(categories[0], list):
-        # Chroma format: metadatas = [[{...}, {...}, ...]]
-        categories = [m.get("category") for m in categories[0]]
+    reduce_3d = {"umap": _umap_3d, "opentsne": _opentsne_3d}.get(plot_reducer(), _tsne_3d)
+    return documents, reduce_3d(vectors), colors
 
-    color_map = {cat: COLORS[i % len(COLORS)] for i, cat in enumerate(CATEGORIES)}
-    colors = [color_map.get(cat, "gray") for cat in categories]
 
-    tsne = TSNE(n_components=3, random_state=42, n_jobs=-1)
-    reduced_vectors = tsne.fit_transform(vectors)
-    return documents, reduced_vectors, colors
+def load_cached_plot_data(path: Path, key: str) -> Optional[Tuple[List[str], np.ndarray, List[str]]]:
+    """
+    Return plot data saved by `save_plot_data_cache` if it was computed for `key`, else None.
+    """
+    try:
+        with np.load(path, allow_pickle=False) as cached:
+            if str(cached["key"]) != key:
+                return None
+            return cached["documents"].tolist(), cached["vectors"], cached["colors"].tolist()
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def save_plot_data_cache(path: Path, key: str, plot_data: Tuple[List[str], np.ndarray, List[str]]) -> None:
+    """
+    Persist plot data (atomically) so later UI refreshes can skip the t-SNE computation.
+    Best-effort: if the cache cannot be written (read-only or missing directory, full disk) the error is logged
+    and the plot simply gets recomputed next time.
+    """
+    documents, vectors, colors = plot_data
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}-", suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            np.savez_compressed(
+                file,
+                key=np.array(key),
+                documents=np.array(documents, dtype=str),
+                vectors=vectors,
+                colors=np.array(colors, dtype=str),
+            )
+        os.replace(tmp_path, path)
+    except OSError as error:
+        _discard_tmp(tmp_path)
+        logger.warning("Could not save plot data cache to %s: %s", path, error)
+    except BaseException:
+        _discard_tmp(tmp_path)
+        raise
+
 
+def _discard_tmp(tmp_path: Optional[str]) -> None:
+    if tmp_path is not None and os.path.exists(tmp_path):
+        os.unlink(tmp_path)
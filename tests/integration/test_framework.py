@@ -73,6 +73,130 @@ class TestDealAgentFramework(unittest.TestCase):
                 # Memory file should have been written
                 self.assertTrue(os.path.exists(memfile))
 
+    def test_get_plot_data_reuses_cached_projection(self):
+        import numpy as np
+        from core import framework as framework_mod
+
+        collection = MagicMock()
+        collection.id = "collection-id"
+        collection.count.return_value = 40
+        fake_client = MagicMock()
+        fake_client.get_or_create_collection.return_value = collection
+        plot_data = (["doc"] * 40, np.zeros((40, 3)), ["red"] * 40)
+
+        with tempfile.TemporaryDirectory() as td:
+            with patch.object(framework_mod, "chromadb") as chromadb_mock, patch.object(
+                framework_mod.DealAgentFramework, "DB", td
+            ), patch.object(framework_mod, "compute_tsne_plot_data", return_value=plot_data) as compute_mock:
+                chromadb_mock.PersistentClient.return_value = fake_client
+
+                first = framework_mod.DealAgentFramework.get_plot_data()
+                second = framework_mod.DealAgentFramework.get_plot_data()
+                compute_mock.assert_called_once()
+
+                collection.count.return_value = 41
+                framework_mod.DealAgentFramework.get_plot_data()
+                self.assertEqual(compute_mock.call_count, 2)
+
+        self.assertEqual(second[0], first[0])
+        np.testing.assert_array_equal(second[1], first[1])
+        self.assertEqual(second[2], first[2])
+
+    def test_get_plot_data_survives_unwritable_cache(self):
+        import numpy as np
+        from core import framework as framework_mod
+        from utils import visualization
+
+        collection = MagicMock()
+        collection.id = "collection-id"
+        collection.count.return_value = 40
+        fake_client = MagicMock()
+        fake_client.get_or_create_collection.return_value = collection
+        plot_data = (["doc"] * 40, np.zeros((40, 3)), ["red"] * 40)
+
+        with tempfile.TemporaryDirectory() as td:
+            with patch.object(framework_mod, "chromadb") as chromadb_mock, patch.object(
+                framework_mod, "compute_tsne_plot_data", return_value=plot_data
+            ):
+                chromadb_mock.PersistentClient.return_value = fake_client
+
+                # Cache directory missing: the temp file cannot even be created.
+                with patch.object(framework_mod.DealAgentFramework, "DB", os.path.join(td, "missing")), self.assertLogs(
+                    visualization.logger, level="WARNING"
+                ):
+                    self.assertIs(framework_mod.DealAgentFramework.get_plot_data(), plot_data)
+
+                # Failure after the temp file exists: it is removed again.
+                with patch.object(framework_mod.DealAgentFramework, "DB", td), patch.object(
+                    visualization.os, "replace", side_effect=OSError("disk full")
+                ), self.assertLogs(visualization.logger, level="WARNING"):
+                    self.assertIs(framework_mod.DealAgentFramework.get_plot_data(), plot_data)
+                self.assertEqual(os.listdir(td), [])
+
+    def test_compute_tsne_plot_data_projects_to_3d(self):
+        import numpy as np
+        from utils.visualization import compute_tsne_plot_data
+
+        rng = np.random.default_rng(0)
+        collection = MagicMock()
+        collection.count.return_value = 60
+        collection.get.return_value = {
+            "embeddings": rng.normal(size=(60, 64)).astype(np.float32),
+            "documents": [f"doc {i}" for i in range(60)],
+            "metadatas": [{"category": "Electronics"} for _ in range(60)],
+        }
+
+        with patch.dict(os.environ, {"DEALS_UI_REDUCER": "tsne"}):
+            documents, vectors, colors = compute_tsne_plot_data(collection=collection)
+
+        self.assertEqual(len(documents), 60)
+        self.assertEqual(vectors.shape, (60, 3))
+        self.assertTrue(np.isfinite(vectors).all())
+        self.assertEqual(len(set(colors)), 1)
+
+    def test_compute_tsne_plot_data_pages_through_chroma(self):
+        import chromadb
+        import numpy as np
+        from utils import visualization
+
+        collection = chromadb.EphemeralClient().get_or_create_collection("plot-paging")
+        vectors = np.arange(75 * 4, dtype=np.float32).reshape(75, 4)
+        collection.add(
+            ids=[f"doc_{i}" for i in range(75)],
+            documents=[f"doc {i}" for i in range(75)],
+            embeddings=vectors,
+            metadatas=[{"category": "Electronics"} for _ in range(75)],
+        )
+
+        with patch.object(visualization, "PLOT_PAGE_SIZE", 20), patch.object(
+            visualization, "plot_reducer", return_value="tsne"
+        ), patch.object(visualization, "_tsne_3d", side_effect=lambda v: v) as reduce_mock:
+            documents, reduced, colors = visualization.compute_tsne_plot_data(
+                collection=collection, max_datapoints=70
+            )
+            everything, _, _ = visualization.compute_tsne_plot_data(collection=collection, max_datapoints=100_000)
+
+        self.assertEqual(reduce_mock.call_count, 2)
+        self.assertEqual(len(everything), 75)  # buffer sized by the collection, not max_datapoints
+        self.assertEqual(len(documents), 70)
+        self.assertEqual(len(colors), 70)
+        self.assertEqual(
+            sorted(documents, key=lambda d: int(d.split()[1])), [f"doc {i}" for i in range(70)]
+        )
+        by_doc = dict(zip(documents, reduced))
+        np.testing.assert_array_equal(by_doc["doc 42"], vectors[42])
+
+    def test_plot_reducer_falls_back_to_tsne_when_not_installed(self):
+        from utils import visualization
+
+        with patch.dict(os.environ, {"DEALS_UI_REDUCER": "umap"}):
+            with patch.object(visualization, "_reducer_available", return_value=False):
+                self.assertEqual(visualization.plot_reducer(), "tsne")
+            with patch.object(visualization, "_reducer_available", return_value=True):
+                self.assertEqual(visualization.plot_reducer(), "umap")
+        with patch.dict(os.environ, {"DEALS_UI_REDUCER": "bogus"}):
+            self.assertEqual(visualization.plot_reducer(), "tsne")
+
 
 if __name__ == "__main__":
     unittest.main()
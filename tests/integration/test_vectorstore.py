@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from tests._testutils import add_src_to_syspath
+
+
+add_src_to_syspath()
+
+
+def _fake_embed(texts, **kwargs):
+    return np.array([[float(len(text)), 1.0, 0.5] for text in texts], dtype=np.float32)
+
+
+def _fake_column_batches(n):
+    def iter_batches(dataset_name, split="train", batch_size=1000, max_items=None):
+        total = n if max_items is None else min(n, max_items)
+        for start in range(0, total, batch_size):
+            rows = range(start, min(start + batch_size, total))
+            yield {
+                "summary": [f"summary {i}" for i in rows],
+                "category": ["Electronics" for _ in rows],
+                "price": [float(i) for i in rows],
+            }
+
+    return iter_batches
+
+
+class TestBuildProductsVectorDb(unittest.TestCase):
+    def test_build_ingests_all_items_in_chunks(self):
+        import chromadb
+        from rag import vectorstore as vs
+
+        with tempfile.TemporaryDirectory() as td:
+            with patch.object(vs, "_db_path", return_value=td), patch.object(
+                vs.Item, "iter_column_batches_from_hub", side_effect=_fake_column_batches(45)
+            ), patch.object(vs, "embed_texts", side_effect=_fake_embed):
+                count = vs.build_products_vectordb(dataset="fake/items", min_required=31, batch_size=10)
+
+            self.assertEqual(count, 45)
+            collection = chromadb.PersistentClient(path=td).get_collection(vs.DEFAULT_COLLECTION)
+            result = collection.get(ids=["doc_0", "doc_44"], include=["documents", "metadatas", "embeddings"])
+            self.assertEqual(sorted(result["documents"]), ["summary 0", "summary 44"])
+            self.assertEqual({m["category"] for m in result["metadatas"]}, {"Electronics"})
+            self.assertEqual(np.asarray(result["embeddings"]).shape, (2, 3))
+
+    def test_build_skips_when_already_populated(self):
+        from rag import vectorstore as vs
+
+        with tempfile.TemporaryDirectory() as td:
+            with patch.object(vs, "_db_path", return_value=td), patch.object(
+                vs.Item, "iter_column_batches_from_hub", side_effect=_fake_column_batches(40)
+            ) as iter_batches, patch.object(vs, "embed_texts", side_effect=_fake_embed):
+                vs.build_products_vectordb(dataset="fake/items", min_required=31)
+                count = vs.build_products_vectordb(dataset="fake/items", min_required=31)
+
+            self.assertEqual(count, 40)
+            iter_batches.assert_called_once()
+
+    def test_build_respects_max_items(self):
+        from rag import vectorstore as vs
+
+        with tempfile.TemporaryDirectory() as td:
+            with patch.object(vs, "_db_path", return_value=td), patch.object(
+                vs.Item, "iter_column_batches_from_hub", side_effect=_fake_column_batches(50)
+            ), patch.object(vs, "embed_texts", side_effect=_fake_embed):
+                count = vs.build_products_vectordb(
+                    dataset="fake/items", min_required=31, max_items=35, batch_size=8
+                )
+
+        self.assertEqual(count, 35)
+
+    def test_build_tops_up_a_partial_collection(self):
+        import chromadb
+        from rag import vectorstore as vs
+
+        with tempfile.TemporaryDirectory() as td:
+            with patch.object(vs, "_db_path", return_value=td), patch.object(
+                vs.Item, "iter_column_batches_from_hub", side_effect=_fake_column_batches(45)
+            ), patch.object(vs, "embed_texts", side_effect=_fake_embed):
+                vs.build_products_vectordb(dataset="fake/items", min_required=31, max_items=20)
+                count = vs.build_products_vectordb(dataset="fake/items", min_required=31, batch_size=10)
+
+            self.assertEqual(count, 65)
+            collection = chromadb.PersistentClient(path=td).get_collection(vs.DEFAULT_COLLECTION)
+            self.assertEqual(collection.count(), 65)
+
+    def test_build_surfaces_background_insert_errors(self):
+        from rag import vectorstore as vs
+
+        with tempfile.TemporaryDirectory() as td:
+            with patch.object(vs, "_db_path", return_value=td), patch.object(
+                vs.Item, "iter_column_batches_from_hub", side_effect=_fake_column_batches(45)
+            ), patch.object(vs, "embed_texts", side_effect=_fake_embed), patch.object(
+                vs, "_add_to_collection", side_effect=RuntimeError("disk full")
+            ):
+                with self.assertRaisesRegex(RuntimeError, "disk full"):
+                    vs.build_products_vectordb(dataset="fake/items", min_required=31, batch_size=10)
+
+    def test_add_falls_back_to_lists_without_widening(self):
+        from rag import vectorstore as vs
+
+        collection = MagicMock()
+        collection.add.side_effect = [TypeError("ndarray not supported"), None]
+        vectors = np.array([[0.1, 0.2]], dtype=np.float32)
+
+        vs._add_to_collection(collection, ids=["doc_0"], documents=["d"], embeddings=vectors, metadatas=[{}])
+
+        first, second = collection.add.call_args_list
+        self.assertIs(first.kwargs["embeddings"], vectors)
+        self.assertEqual(second.kwargs["embeddings"], vectors.tolist())
+
+    def test_cli_batch_size_controls_encode_batch(self):
+        from rag import vectorstore as vs
+
+        with patch.object(vs, "load_dotenv"), patch.object(
+            vs, "ensure_products_vectordb", return_value=100
+        ) as ensure_mock:
+            vs.main(["--batch-size", "16"])
+
+        self.assertEqual(ensure_mock.call_args.kwargs["encode_batch_size"], 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
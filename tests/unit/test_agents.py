@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import time
 import unittest
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
@@ -69,6 +70,80 @@ class TestAgents(unittest.TestCase):
 
         self.assertAlmostEqual(price, 123.45, places=2)
 
+    def test_frontier_agent_price_many_batches_rag_lookup_and_keeps_order(self):
+        from agents.pricing.frontier_agent import FrontierAgent
+
+        def create(model, messages, **kwargs):
+            # Answer the first product last, so results only line up if price_many keeps input order
+            number = int(messages[0]["content"].split("item ")[1][0])
+            time.sleep(0.05 if number == 1 else 0)
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=f"${number}00"))])
+
+        fake_openai = MagicMock()
+        fake_openai.chat.completions.create.side_effect = create
+        descriptions = ["item 1", "item 2", "item 3"]
+
+        with patch("agents.pricing.frontier_agent.OpenAI", return_value=fake_openai), patch(
+            "agents.pricing.frontier_agent.ChromaRetriever"
+        ) as RetrieverMock:
+            RetrieverMock.return_value.query_similars_batch.return_value = [(["doc"], [9.0])] * 3
+
+            agent = FrontierAgent(object())
+            prices = agent.price_many(descriptions)
+
+        RetrieverMock.return_value.query_similars_batch.assert_called_once_with(descriptions, n_results=5)
+        RetrieverMock.return_value.query_similars.assert_not_called()
+        self.assertEqual(prices, [100.0, 200.0, 300.0])
+
+    def test_planning_agent_plan_picks_best_discount_from_batched_estimates(self):
+        from agents.planners import planning_agent as planning_mod
+        from data.models import DealSelection
+
+        deals = [
+            {"product_description": "kettle", "price": 20.0, "url": "https://x"},
+            {"product_description": "drill", "price": 50.0, "url": "https://y"},
+            {"product_description": "lamp", "price": 10.0, "url": "https://z"},
+        ]
+
+        with patch.object(planning_mod, "ScannerAgent") as ScannerMock, patch.object(
+            planning_mod, "EnsembleAgent"
+        ) as EnsembleMock, patch.object(planning_mod, "MessagingAgent") as MessagingMock:
+            ScannerMock.return_value.scan.return_value = DealSelection(deals=deals)
+            EnsembleMock.return_value.price_many.return_value = [40.0, 180.0, 70.0]
+
+            agent = planning_mod.PlanningAgent(object())
+            best = agent.plan(memory=[])
+
+            ScannerMock.return_value.scan.return_value = DealSelection(deals=[])
+            self.assertIsNone(agent.plan(memory=[]))
+
+        EnsembleMock.return_value.price_many.assert_called_once_with(["kettle", "drill", "lamp"])
+        EnsembleMock.return_value.price.assert_not_called()
+        self.assertEqual(best.deal.url, "https://y")
+        self.assertEqual(best.discount, 130.0)
+        MessagingMock.return_value.alert.assert_called_once_with(best)
+
+    def test_ensemble_agent_price_many_combines_estimates_in_order(self):
+        from agents.pricing import ensemble_agent as ensemble_mod
+
+        with patch.object(ensemble_mod, "SpecialistAgent") as SpecialistMock, patch.object(
+            ensemble_mod, "FrontierAgent"
+        ) as FrontierMock, patch.object(ensemble_mod, "Preprocessor") as PreprocessorMock:
+            PreprocessorMock.return_value.preprocess.side_effect = lambda text: f"rewritten {text}"
+            SpecialistMock.return_value.price.side_effect = lambda text: 100.0 if "a" in text else 200.0
+            FrontierMock.return_value.price_many.side_effect = lambda texts, executor: list(
+                executor.map(lambda text: 10.0 if "a" in text else 20.0, texts)
+            )
+
+            agent = ensemble_mod.EnsembleAgent(object())
+            estimates = agent.price_many(["a", "b"])
+
+        FrontierMock.return_value.price_many.assert_called_once()
+        # Frontier calls share the ensemble's pool, so the overall concurrency cap holds
+        shared = FrontierMock.return_value.price_many.call_args.kwargs["executor"]
+        self.assertEqual(shared._max_workers, ensemble_mod.EnsembleAgent.MAX_CONCURRENT_REQUESTS)
+        self.assertEqual(estimates, [10.0 * 0.8 + 100.0 * 0.2, 20.0 * 0.8 + 200.0 * 0.2])
+
     def test_messaging_agent_sends_pushover(self):
         from agents.messaging.messaging_agent import MessagingAgent
 
@@ -90,6 +165,43 @@ class TestAgents(unittest.TestCase):
 
             pushover.send.assert_called()
 
+    def test_pushover_client_posts_in_background_over_shared_session(self):
+        from services.notifications.pushover import PUSHOVER_URL, PushoverClient
+
+        session = MagicMock()
+        with patch.object(PushoverClient, "_session", session):
+            client = PushoverClient(user="u", token="t")
+            client.send("first").result(timeout=5)
+            client.send("second", sound="none").result(timeout=5)
+
+        self.assertEqual(session.post.call_count, 2)
+        args, kwargs = session.post.call_args
+        self.assertEqual(args, (PUSHOVER_URL,))
+        self.assertEqual(kwargs["data"]["message"], "second")
+        self.assertEqual(kwargs["data"]["sound"], "none")
+        self.assertIn("timeout", kwargs)
+        session.post.return_value.raise_for_status.assert_called()
+
+    def test_pushover_client_logs_failed_sends(self):
+        import requests
+        from services.notifications.pushover import PushoverClient
+
+        session = MagicMock()
+        session.post.side_effect = requests.ConnectionError("unreachable")
+        with patch.object(PushoverClient, "_session", session), self.assertLogs(
+            "services.notifications.pushover", level="ERROR"
+        ) as logs:
+            future = PushoverClient(user="u", token="t").send("hello")
+            with self.assertRaises(requests.ConnectionError):
+                future.result(timeout=5)
+            # Done callbacks run just after the result is published, so give the logger a moment.
+            for _ in range(100):
+                if logs.records:
+                    break
+                time.sleep(0.01)
+
+        self.assertIn("unreachable", logs.output[0])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+
+from tests._testutils import add_src_to_syspath
+
+
+add_src_to_syspath()
+
+
+def _opportunity(i: int):
+    from data.models import Deal, Opportunity
+
+    return Opportunity(
+        deal=Deal(product_description=f"item {i}", price=10.0 + i, url=f"https://deal/{i}"),
+        estimate=50.0 + i,
+        discount=40.0,
+    )
+
+
+class TestMemoryStore(unittest.TestCase):
+    def test_write_then_read_round_trips(self):
+        from core.memory import MemoryStore
+
+        with tempfile.TemporaryDirectory() as td:
+            store = MemoryStore(os.path.join(td, "memory.json"))
+            store.write([_opportunity(0), _opportunity(1)])
+            restored = store.read()
+
+            with open(store.filename) as file:
+                self.assertEqual(len(json.load(file)), 2)  # plain JSON on disk
+
+        self.assertEqual(restored, [_opportunity(0), _opportunity(1)])
+
+    def test_reset_keep_first_truncates(self):
+        from core.memory import MemoryStore
+
+        with tempfile.TemporaryDirectory() as td:
+            store = MemoryStore(os.path.join(td, "memory.json"))
+            store.write([_opportunity(i) for i in range(5)])
+            store.reset_keep_first(2)
+
+            self.assertEqual(store.read(), [_opportunity(0), _opportunity(1)])
+
+    def test_writes_keep_file_permissions(self):
+        from core.memory import MemoryStore
+
+        with tempfile.TemporaryDirectory() as td:
+            store = MemoryStore(os.path.join(td, "memory.json"))
+            store.write([_opportunity(0)])
+            umask = os.umask(0)
+            os.umask(umask)
+            self.assertEqual(os.stat(store.filename).st_mode & 0o777, 0o666 & ~umask)
+
+            os.chmod(store.filename, 0o644)
+            store.write([_opportunity(0), _opportunity(1)])
+            store.reset_keep_first(1)
+            self.assertEqual(os.stat(store.filename).st_mode & 0o777, 0o644)
+
+    def test_new_file_mode_does_not_touch_process_umask(self):
+        from unittest.mock import patch
+
+        from core import memory
+
+        with tempfile.TemporaryDirectory() as td, patch.object(
+            memory.os, "umask", side_effect=AssertionError("umask changed while writing")
+        ):
+            memory.MemoryStore(os.path.join(td, "memory.json")).write([_opportunity(0)])
+
+    def test_reset_keep_first_creates_missing_file(self):
+        from core.memory import MemoryStore
+
+        with tempfile.TemporaryDirectory() as td:
+            store = MemoryStore(os.path.join(td, "memory.json"))
+            store.reset_keep_first(2)
+
+            self.assertEqual(store.read(), [])
+
+    def test_reset_keep_first_ignores_entries_after_n(self):
+        from core.memory import MemoryStore
+
+        with tempfile.TemporaryDirectory() as td:
+            store = MemoryStore(os.path.join(td, "memory.json"))
+            first = json.dumps([_opportunity(0).model_dump(), _opportunity(1).model_dump()])
+            with open(store.filename, "w") as file:
+                # Anything past the first two entries is never decoded.
+                file.write(first[:-1] + ", {not valid json")
+            store.reset_keep_first(2)
+
+            self.assertEqual(store.read(), [_opportunity(0), _opportunity(1)])
+
+    def test_reset_keep_first_rejects_truncated_file(self):
+        from core.memory import MemoryStore
+
+        with tempfile.TemporaryDirectory() as td:
+            store = MemoryStore(os.path.join(td, "memory.json"))
+            for text in ("[", "[1,", "[1,2", " [ 1 2"):
+                with open(store.filename, "w") as file:
+                    file.write(text)
+                with self.assertRaises(json.JSONDecodeError, msg=text):
+                    store.reset_keep_first(5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+from tests._testutils import add_src_to_syspath
+
+
+add_src_to_syspath()
+
+
+class TestItem(unittest.TestCase):
+    ROWS = [
+        {"title": "Kettle", "category": "Appliances", "price": 25.5, "full": None, "weight": None,
+         "summary": "An electric kettle", "prompt": None, "id": 1},
+        {"title": "Drill", "category": "Tools_and_Home_Improvement", "price": 80.0, "full": "Cordless drill",
+         "weight": 2.5, "summary": "A cordless drill", "prompt": None, "id": 2},
+    ]
+
+    def test_from_hub_builds_items_for_each_split(self):
+        from datasets import Dataset, DatasetDict
+        from data import models as models_mod
+
+        ds = DatasetDict(
+            {
+                "train": Dataset.from_list(self.ROWS),
+                "validation": Dataset.from_list(self.ROWS[:1]),
+                "test": Dataset.from_list(self.ROWS[1:]),
+            }
+        )
+        with patch.object(models_mod, "load_dataset", return_value=ds):
+            train, val, test = models_mod.Item.from_hub("fake/items")
+
+        self.assertEqual(len(train), 2)
+        self.assertIsInstance(train[0], models_mod.Item)
+        self.assertEqual(train[1].summary, "A cordless drill")
+        self.assertEqual(train[1].weight, 2.5)
+        self.assertIsNone(train[0].full)
+        self.assertEqual([item.title for item in val + test], ["Kettle", "Drill"])
+
+    def test_iter_column_batches_from_hub_caps_rows(self):
+        from datasets import Dataset
+        from data import models as models_mod
+
+        rows = [{key: row[key] for key in ("summary", "category", "price")} for row in self.ROWS * 3]
+        ds = Dataset.from_list(rows).to_iterable_dataset()
+        with patch.object(models_mod, "load_dataset", return_value=ds) as load_mock:
+            batches = list(models_mod.Item.iter_column_batches_from_hub("fake/items", batch_size=2, max_items=5))
+
+        load_mock.assert_called_once_with("fake/items", split="train", streaming=True)
+        self.assertEqual([len(batch["summary"]) for batch in batches], [2, 2, 1])
+        self.assertEqual(batches[0]["category"], ["Appliances", "Tools_and_Home_Improvement"])
+
+
+if __name__ == "__main__":
+    unittest.main()
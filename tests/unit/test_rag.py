@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from tests._testutils import add_src_to_syspath
+
+
+add_src_to_syspath()
+
+
+class _FakeTokenizer:
+    """
+    One token per word; `pad` right-pads with zeros like a HuggingFace tokenizer.
+    """
+
+    def __call__(self, texts, **kwargs):
+        ids = [[1] * len(text.split()) for text in texts]
+        return {"input_ids": ids, "attention_mask": [[1] * len(row) for row in ids]}
+
+    def pad(self, features, **kwargs):
+        import torch
+
+        width = max(len(row) for row in features["input_ids"])
+        return {key: torch.tensor([row + [0] * (width - len(row)) for row in rows]) for key, rows in features.items()}
+
+
+class _FakeEncoder:
+    """
+    Minimal SentenceTransformer stand-in whose embedding is [number of real tokens, 0].
+    """
+
+    max_seq_length = 256
+    device = "cpu"
+
+    def __init__(self):
+        self.tokenizer = _FakeTokenizer()
+
+    def __getitem__(self, index):
+        return MagicMock(do_lower_case=False)
+
+    def eval(self):
+        return self
+
+    def __call__(self, features):
+        import torch
+
+        counts = features["attention_mask"].sum(dim=1).float()
+        return {"sentence_embedding": torch.stack([counts, torch.zeros_like(counts)], dim=1)}
+
+
+class TestRag(unittest.TestCase):
+    def test_query_cache_evicts_least_recently_used(self):
+        from rag.query_cache import QueryEmbeddingCache
+
+        cache = QueryEmbeddingCache(maxsize=2)
+        cache.put("m", "a", np.array([1.0]))
+        cache.put("m", "b", np.array([2.0]))
+        cache.get("m", "a")  # touch "a" so "b" becomes the oldest entry
+        cache.put("m", "c", np.array([3.0]))
+
+        self.assertIsNotNone(cache.get("m", "a"))
+        self.assertIsNone(cache.get("m", "b"))
+        self.assertIsNone(cache.get("other-model", "a"))
+
+    def test_retriever_embeds_repeated_query_once(self):
+        from rag.query_cache import QueryEmbeddingCache
+        from rag import retriever as retriever_mod
+
+        collection = MagicMock()
+        collection.query.return_value = {
+            "documents": [["doc1"]],
+            "metadatas": [[{"price": 9.99}]],
+        }
+
+        with patch.object(
+            retriever_mod, "embed_texts", return_value=np.array([[0.1, 0.2]])
+        ) as embed_mock:
+            retriever = retriever_mod.ChromaRetriever(collection=collection, cache=QueryEmbeddingCache())
+            first = retriever.query_similars("same description")
+            second = retriever.query_similars("same description")
+
+        embed_mock.assert_called_once()
+        self.assertEqual(first, (["doc1"], [9.99]))
+        self.assertEqual(first, second)
+
+    def test_retriever_batches_queries_into_one_encode_and_query(self):
+        from rag.query_cache import QueryEmbeddingCache
+        from rag import retriever as retriever_mod
+
+        collection = MagicMock()
+        collection.query.return_value = {
+            "documents": [["doc-a"], ["doc-b"]],
+            "metadatas": [[{"price": 1.0}], [{"price": 2.0}]],
+        }
+
+        with patch.object(
+            retriever_mod, "embed_texts", return_value=np.array([[0.1, 0.2], [0.3, 0.4]])
+        ) as embed_mock:
+            retriever = retriever_mod.ChromaRetriever(collection=collection, cache=QueryEmbeddingCache())
+            results = retriever.query_similars_batch(["a", "b"], n_results=1)
+
+        embed_mock.assert_called_once()
+        collection.query.assert_called_once()
+        self.assertEqual(collection.query.call_args.kwargs["include"], ["documents", "metadatas"])
+        self.assertEqual(results, [(["doc-a"], [1.0]), (["doc-b"], [2.0])])
+
+    def test_embed_texts_only_encodes_cache_misses(self):
+        from rag import embeddings as embeddings_mod
+        from rag.embed_cache import EmbeddingCache
+
+        encoder = MagicMock()
+        encoder.encode.side_effect = lambda texts, **kwargs: np.array(
+            [[float(len(text)), 1.0] for text in texts], dtype=np.float32
+        )
+
+        with tempfile.TemporaryDirectory() as td:
+            cache = EmbeddingCache(Path(td) / "embeddings.sqlite")
+            with patch.object(embeddings_mod, "get_embedding_cache", return_value=cache), patch.object(
+                embeddings_mod, "get_encoder", return_value=encoder
+            ):
+                first = embeddings_mod.embed_texts(["a", "bb"], model_name="m")
+                second = embeddings_mod.embed_texts(["bb", "ccc", "a"], model_name="m")
+
+        self.assertEqual(encoder.encode.call_count, 2)
+        self.assertEqual(encoder.encode.call_args_list[1].args[0], ["ccc"])
+        np.testing.assert_array_equal(first, [[1.0, 1.0], [2.0, 1.0]])
+        np.testing.assert_array_equal(second, [[2.0, 1.0], [3.0, 1.0], [1.0, 1.0]])
+
+    def test_embed_texts_keeps_half_precision_gpu_vectors_apart_from_fp32(self):
+        import os
+
+        from rag import embeddings as embeddings_mod
+        from rag.embed_cache import EmbeddingCache
+
+        encoder = MagicMock()
+        encoder.encode.side_effect = lambda texts, **kwargs: np.ones((len(texts), 2), dtype=np.float32)
+
+        with tempfile.TemporaryDirectory() as td:
+            cache = EmbeddingCache(Path(td) / "embeddings.sqlite")
+            with patch.object(embeddings_mod, "get_embedding_cache", return_value=cache), patch.object(
+                embeddings_mod, "get_encoder", return_value=encoder
+            ), patch.dict(os.environ, {"EMBED_BACKEND": "torch"}), patch.object(
+                embeddings_mod.torch.cuda, "is_bf16_supported", return_value=True
+            ):
+                with patch.object(embeddings_mod.torch.cuda, "is_available", return_value=True):
+                    self.assertEqual(embeddings_mod._cache_namespace("m"), "m#bfloat16")
+                    embeddings_mod.embed_texts(["a"], model_name="m")  # bf16 run fills the cache
+                with patch.object(embeddings_mod.torch.cuda, "is_available", return_value=False):
+                    self.assertEqual(embeddings_mod._cache_namespace("m"), "m")
+                    embeddings_mod.embed_texts(["a"], model_name="m")  # FP32 run must not reuse it
+
+        self.assertEqual(encoder.encode.call_count, 2)
+
+    def test_embed_texts_truncates_long_texts_before_encoding(self):
+        from rag import embeddings as embeddings_mod
+
+        encoder = MagicMock()
+        encoder.encode.side_effect = lambda texts, **kwargs: np.array(
+            [[float(len(text))] for text in texts], dtype=np.float32
+        )
+        long_text = "x" * (embeddings_mod.MAX_ENCODE_CHARS + 500)
+
+        with patch.object(embeddings_mod, "get_encoder", return_value=encoder):
+            vectors = embeddings_mod.embed_texts(["short", long_text], model_name="m", use_cache=False)
+
+        np.testing.assert_array_equal(vectors[:, 0], [5.0, float(embeddings_mod.MAX_ENCODE_CHARS)])
+
+    def test_embed_texts_falls_back_to_encoding_when_cache_is_unusable(self):
+        from rag import embed_cache as embed_cache_mod
+        from rag import embeddings as embeddings_mod
+
+        encoder = MagicMock()
+        encoder.encode.side_effect = lambda texts, **kwargs: np.ones((len(texts), 2), dtype=np.float32)
+
+        with tempfile.TemporaryDirectory() as td:
+            not_a_dir = Path(td) / "file"
+            not_a_dir.touch()
+            embed_cache_mod.get_embedding_cache.cache_clear()
+            try:
+                with patch.dict("os.environ", {"EMBED_CACHE_PATH": str(not_a_dir / "embeddings.sqlite")}), patch.object(
+                    embeddings_mod, "get_encoder", return_value=encoder
+                ), self.assertLogs("rag.embed_cache", level="WARNING"):
+                    vectors = embeddings_mod.embed_texts(["hello"], model_name="m")
+            finally:
+                embed_cache_mod.get_embedding_cache.cache_clear()
+
+            cache = embed_cache_mod.EmbeddingCache(Path(td) / "embeddings.sqlite")
+            cache._conn.close()  # any sqlite error on a live cache counts as a miss / skipped write
+            with self.assertLogs("rag.embed_cache", level="WARNING") as logs:
+                self.assertEqual(cache.get_many([cache.key("m", "hello")]), {})
+                cache.put_many([(cache.key("m", "hello"), np.ones(2, dtype=np.float32))])
+
+        np.testing.assert_array_equal(vectors, [[1.0, 1.0]])
+        self.assertEqual(len(logs.records), 1)  # warned once
+
+    def test_embedding_cache_float16_storage_round_trips_as_float32(self):
+        from rag.embed_cache import EmbeddingCache
+
+        vector = np.array([0.123456, -0.5, 0.75], dtype=np.float32)
+        with tempfile.TemporaryDirectory() as td:
+            cache = EmbeddingCache(Path(td) / "embeddings.sqlite", dtype="float16")
+            key = cache.key("m", "text")
+            cache.put_many([(key, vector)])
+            restored = cache.get_many([key])[key]
+
+        self.assertEqual(restored.dtype, np.float32)
+        np.testing.assert_allclose(restored, vector, atol=1e-3)
+
+    def test_token_budget_batches_cover_all_indices_within_budget(self):
+        from rag.embeddings import token_budget_batches
+
+        lengths = [5, 100, 7, 60, 3, 100, 50]
+        batches = token_budget_batches(lengths, token_budget=200)
+
+        self.assertEqual(sorted(i for batch in batches for i in batch), list(range(len(lengths))))
+        for batch in batches:
+            self.assertLessEqual(max(lengths[i] for i in batch) * len(batch), 200)
+        self.assertEqual(batches[0], [1, 5])  # longest texts are grouped first
+
+    def test_dynamic_batching_preserves_input_order(self):
+        from rag import embeddings as embeddings_mod
+
+        texts = ["one", "one two three", "one two", "one two three four"]
+
+        with patch.object(embeddings_mod, "get_encoder", return_value=_FakeEncoder()), patch.dict(
+            "os.environ", {"RAG_DYNAMIC_BATCH": "1"}
+        ):
+            vectors = embeddings_mod.embed_texts(texts, model_name="m", use_cache=False)
+
+        np.testing.assert_array_equal(vectors[:, 0], [1.0, 3.0, 2.0, 4.0])
+
+    def test_onnx_sessions_use_the_configured_thread_budget(self):
+        from rag import embeddings as embeddings_mod
+
+        with patch.object(embeddings_mod, "configure_torch_threads", return_value=3):
+            kwargs = embeddings_mod._onnx_model_kwargs()
+
+        self.assertEqual(kwargs["session_options"].intra_op_num_threads, 3)
+
+    def test_onnx_int8_encoder_is_exported_once_then_reloaded(self):
+        from rag import embeddings as embeddings_mod
+
+        def fake_export(encoder, config, path):
+            target = Path(path) / f"onnx/model_qint8_{config}.onnx"
+            target.parent.mkdir(parents=True)
+            target.touch()
+
+        with tempfile.TemporaryDirectory() as td, patch.object(
+            embeddings_mod, "ONNX_INT8_CACHE_DIR", Path(td)
+        ), patch.object(embeddings_mod, "SentenceTransformer") as st_mock, patch.object(
+            embeddings_mod, "_onnx_model_kwargs", return_value={}
+        ), patch(
+            "sentence_transformers.export_dynamic_quantized_onnx_model", side_effect=fake_export
+        ) as export_mock:
+            embeddings_mod._load_onnx_int8_encoder("org/model")
+            embeddings_mod._load_onnx_int8_encoder("org/model")
+
+        export_mock.assert_called_once()
+        reload_kwargs = st_mock.call_args.kwargs
+        self.assertEqual(st_mock.call_args.args[0], str(Path(td) / "org__model"))
+        self.assertEqual(reload_kwargs["backend"], "onnx")
+        self.assertTrue(reload_kwargs["model_kwargs"]["file_name"].startswith("onnx/model_qint8_"))
+
+
+if __name__ == "__main__":
+    unittest.main()
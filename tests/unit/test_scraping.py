@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+from tests._testutils import add_src_to_syspath
+
+
+add_src_to_syspath()
+
+
+def _entry(i: int) -> dict:
+    return {
+        "title": f"Deal {i}",
+        "summary": f'<div class="snippet summary">Snippet {i}</div>',
+        "links": [{"href": f"https://example.com/deal/{i}"}],
+    }
+
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Deals</title>
+<item><title>Kettle &amp; mug</title><link>https://example.com/deal/1</link>
+<description>&lt;div class="snippet summary"&gt;Save &lt;b&gt;$5&lt;/b&gt;&lt;/div&gt;</description></item>
+<item><title>Drill</title><link>https://example.com/deal/2</link>
+<description><![CDATA[<div class="snippet summary">Cordless</div>]]></description></item>
+</channel></rss>"""
+
+
+def _page(url: str) -> bytes:
+    return f'<div class="content-section">Details for {url}\nFeatures fast</div>'.encode()
+
+
+class TestScraping(unittest.TestCase):
+    def test_fetch_builds_deals_from_concurrently_fetched_pages(self):
+        from scraping import rss_scraper
+
+        with patch.object(rss_scraper, "feeds", ["https://example.com/rss"]), patch.object(
+            rss_scraper, "_session"
+        ), patch.object(rss_scraper, "parse_feed", return_value=[_entry(i) for i in range(12)]), patch.object(
+            rss_scraper.ScrapedDeal, "_fetch_page", side_effect=_page
+        ) as fetch_mock:
+            deals = rss_scraper.ScrapedDeal.fetch()
+
+        self.assertEqual(fetch_mock.call_count, 10)  # only the first 10 entries per feed
+        self.assertEqual([deal.title for deal in deals], [f"Deal {i}" for i in range(10)])
+        self.assertEqual(deals[3].summary, "Snippet 3")
+        self.assertEqual(deals[3].details.strip(), "Details for https://example.com/deal/3")
+        self.assertEqual(deals[3].features.strip(), "fast")
+
+    def test_fetch_skips_feeds_that_fail_to_download(self):
+        import requests
+
+        from scraping import rss_scraper
+
+        def get(url, timeout):
+            if url == "https://example.com/down":
+                raise requests.ConnectionError("connection refused")
+            response = requests.Response()
+            response.status_code = 503 if url == "https://example.com/busy" else 200
+            response._content = RSS
+            return response
+
+        feed_urls = ["https://example.com/down", "https://example.com/busy", "https://example.com/rss"]
+        with patch.object(rss_scraper, "feeds", feed_urls), patch.object(
+            rss_scraper, "_session"
+        ) as session_mock, patch.object(rss_scraper.ScrapedDeal, "_fetch_page", side_effect=_page), self.assertLogs(
+            rss_scraper.logger, level="WARNING"
+        ) as logs:
+            session_mock.return_value.get.side_effect = get
+            deals = rss_scraper.ScrapedDeal.fetch()
+
+        self.assertEqual([deal.title for deal in deals], ["Kettle & mug", "Drill"])
+        self.assertEqual(len(logs.records), 2)
+
+    def test_page_fetches_use_timeout_and_retrying_session(self):
+        from scraping import rss_scraper
+
+        adapter = rss_scraper._session().get_adapter("https://www.dealnews.com/")
+        self.assertEqual(adapter.max_retries.total, 2)
+        self.assertIn(503, adapter.max_retries.status_forcelist)
+
+        with patch.object(rss_scraper, "_session") as session_mock:
+            rss_scraper.ScrapedDeal._fetch_page("https://example.com/deal/1")
+
+        session_mock.return_value.get.assert_called_once_with(
+            "https://example.com/deal/1", timeout=rss_scraper.REQUEST_TIMEOUT
+        )
+
+    def test_extract_deal_snippet_matches_beautifulsoup_fallback(self):
+        from scraping import html_parser
+
+        html = '<div class="snippet summary">Save <b>$20</b> on\n&lt;i&gt;this&lt;/i&gt;</div><p>ignored</p>'
+        expected = "Save$20on this"
+
+        self.assertEqual(html_parser.extract_deal_snippet(html), expected)
+        with patch.object(html_parser, "HTMLParser", None):
+            self.assertEqual(html_parser.extract_deal_snippet(html), expected)
+            self.assertEqual(html_parser.extract_deal_snippet("no snippet div"), "no snippet div")
+
+    def test_parse_feed_matches_feedparser_entries(self):
+        from scraping import rss_scraper
+
+        def shape(entries):
+            return [(e["title"], e["summary"], e["links"][0]["href"]) for e in entries]
+
+        parsed = rss_scraper.parse_feed(RSS)
+        with patch.object(rss_scraper, "etree", None):
+            fallback = rss_scraper.parse_feed(RSS)
+
+        self.assertEqual(shape(parsed), shape(fallback))
+        self.assertEqual(shape(parsed)[0][:2], ("Kettle & mug", '<div class="snippet summary">Save <b>$5</b></div>'))
+
+    def test_parse_feed_falls_back_to_feedparser_on_malformed_xml(self):
+        from scraping import rss_scraper
+
+        truncated = RSS.rsplit(b"</item>", 1)[0]
+        entries = rss_scraper.parse_feed(truncated)
+
+        self.assertEqual([e["title"] for e in entries][:1], ["Kettle & mug"])
+
+    def test_parse_feed_falls_back_to_feedparser_for_atom(self):
+        from scraping import rss_scraper
+
+        atom = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Deals</title>
+<entry><title>Kettle</title><link href="https://example.com/deal/1"/><summary>Cheap kettle</summary></entry>
+</feed>"""
+        entries = rss_scraper.parse_feed(atom)
+
+        self.assertEqual([(e["title"], e["links"][0]["href"]) for e in entries], [("Kettle", "https://example.com/deal/1")])
+
+
+if __name__ == "__main__":
+    unittest.main()
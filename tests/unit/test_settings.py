@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import os
+import unittest
+from unittest.mock import patch
+
+from tests._testutils import add_src_to_syspath
+
+
+add_src_to_syspath()
+
+
+class TestSettings(unittest.TestCase):
+    def setUp(self):
+        from config.settings import get_settings
+
+        get_settings.cache_clear()
+        self.addCleanup(get_settings.cache_clear)
+
+    def test_settings_read_environment_at_creation_and_refresh(self):
+        from config.settings import Settings, get_settings
+
+        with patch.dict(os.environ, {"PLANNER_MODE": "Workflow"}):
+            first = get_settings()
+            self.assertEqual(first.planner_mode, "workflow")
+
+            os.environ["PLANNER_MODE"] = "autonomous"
+            self.assertIs(get_settings(), first)  # cached until refreshed
+            self.assertEqual(get_settings().planner_mode, "workflow")
+
+            refreshed = Settings.refresh()
+
+        self.assertIsNot(refreshed, first)
+        self.assertEqual(refreshed.planner_mode, "autonomous")
+        self.assertIs(get_settings(), refreshed)
+
+
+if __name__ == "__main__":
+    unittest.main()